@@ -3,9 +3,160 @@ from singer_sdk.authenticators import APIAuthenticatorBase
 from singer_sdk.streams import Stream as RESTStreamBase
 from typing import Optional, Any
 from datetime import datetime
+import os
+import threading
 import requests
 import json
 
+from tap_easyecom.files import atomic_write
+
+# Refresh this many seconds before the token expires.
+DEFAULT_REFRESH_MARGIN = 300
+# Never renew a token sooner than this after obtaining it.
+MIN_REFRESH_DELAY = 30
+
+
+class TokenManager:
+    """Owns the EasyEcom access token shared by every stream and worker.
+
+    Refreshes are single-flight: callers that find the token stale while a
+    login is in progress wait for it and reuse its result. Once a token is
+    obtained, a background timer renews it `refresh_margin` seconds before
+    `expires_in` runs out, so requests normally never wait on a login.
+
+    With a `location_key`, the manager logs in to that location and keeps
+    its token under `location_tokens` in the config instead of at the top.
+    """
+
+    def __init__(
+        self,
+        tap,
+        auth_endpoint: str,
+        refresh_margin: int = DEFAULT_REFRESH_MARGIN,
+        location_key: Optional[str] = None,
+    ) -> None:
+        self._tap = tap
+        self.auth_endpoint = auth_endpoint
+        self.refresh_margin = refresh_margin
+        self.location_key = location_key
+        self.logger = tap.logger
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+    @property
+    def token_config(self) -> dict:
+        """Return the part of the config that holds this manager's token."""
+        if self.location_key is None:
+            return self._tap._config
+        location_tokens = self._tap._config.setdefault("location_tokens", {})
+        return location_tokens.setdefault(self.location_key, {})
+
+    @property
+    def access_token(self) -> Optional[str]:
+        return self.token_config.get("access_token")
+
+    @property
+    def expires_at(self) -> int:
+        return self.token_config.get("created_at", 0) + self.token_config.get(
+            "expires_in", 0
+        )
+
+    @property
+    def request_body(self) -> dict:
+        """Define the OAuth request body for the API."""
+        return {
+            "email": self._tap.config.get("email"),
+            "password": self._tap.config.get("password"),
+            "location_key": self.location_key or self._tap.config.get("location_key"),
+        }
+
+    def is_token_valid(self) -> bool:
+        now = round(datetime.utcnow().timestamp())
+        return now < self.expires_at - 60
+
+    def get_token(self) -> str:
+        """Return a valid access token, logging in first if needed."""
+        token = self.access_token
+        if not token or not self.is_token_valid():
+            self.refresh(stale_token=token)
+            token = self.access_token
+        elif self._timer is None:
+            self._schedule_refresh()
+        return token
+
+    def refresh(self, stale_token: Optional[str] = None, force: bool = False) -> None:
+        """Log in again, unless another caller already did while we waited.
+
+        A valid token other than `stale_token` is kept, so callers that
+        found no token or an expired one share a single login. `force`
+        logs in even while the token is still valid.
+
+        Raises:
+            RuntimeError: When OAuth login fails.
+        """
+        with self._lock:
+            token = self.access_token
+            if (
+                not force
+                and token is not None
+                and token != stale_token
+                and self.is_token_valid()
+            ):
+                return
+            self._login()
+            self._schedule_refresh()
+
+    def _login(self) -> None:
+        token_response = (self._tap.transport or self._tap.requests_session).post(
+            self.auth_endpoint, data=self.request_body
+        )
+        try:
+            token_last_refreshed = round(datetime.utcnow().timestamp())
+            token_response.raise_for_status()
+            self.logger.info("OAuth authorization attempt was successful.")
+            token_json = token_response.json()
+            token = token_json["data"]["token"]
+        except Exception as ex:
+            raise RuntimeError(
+                f"Failed login, response was '{token_response.text}'. {ex}"
+            )
+
+        self._tap.metrics.observe_token_refresh()
+        with self._tap._token_manager_lock:
+            token_config = self.token_config
+            token_config["created_at"] = token_last_refreshed
+            token_config["access_token"] = token["jwt_token"]
+            token_config["expires_in"] = token["expires_in"]
+            self._write_config()
+
+    def _write_config(self) -> None:
+        """Persist the config atomically so readers never see a partial file."""
+        config_file = getattr(self._tap, "config_file", None)
+        if not isinstance(config_file, (str, os.PathLike)):
+            return
+        atomic_write(config_file, json.dumps(self._tap._config, indent=4), fsync=True)
+
+    def _schedule_refresh(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        expires_in = self.token_config.get("expires_in", 0)
+        if self.refresh_margin < expires_in:
+            now = round(datetime.utcnow().timestamp())
+            delay = max(self.expires_at - self.refresh_margin - now, 0)
+        else:
+            # The margin would renew the token as soon as it is obtained.
+            delay = max(expires_in / 2, MIN_REFRESH_DELAY)
+        self._timer = threading.Timer(delay, self._refresh_in_background)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _refresh_in_background(self) -> None:
+        try:
+            self.refresh(force=True)
+        except Exception as ex:
+            # Callers log in themselves once the token actually expires.
+            self.logger.warning(f"Background token refresh failed: {ex}")
+
 
 class BearerTokenAuthenticator(APIAuthenticatorBase):
     """API Authenticator for OAuth 2.0 flows."""
@@ -15,43 +166,52 @@ class BearerTokenAuthenticator(APIAuthenticatorBase):
         stream: RESTStreamBase,
         config_file: Optional[str] = None,
         auth_endpoint: Optional[str] = None,
+        location_key: Optional[str] = None,
     ) -> None:
         super().__init__(stream=stream)
         self._auth_endpoint = auth_endpoint
         self._config_file = config_file
         self._tap = stream._tap
-        self.expires_in = self._tap.config.get("expires_in", 0)
+        self.token_manager = self._tap.get_token_manager(
+            self.auth_endpoint, location_key
+        )
+
+    @property
+    def expires_in(self) -> int:
+        return self.token_manager.token_config.get("expires_in", 0)
 
     def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
         """Make an HTTP request with automatic token refresh on 401 errors.
-        
+
         Args:
             method: HTTP method (GET, POST, etc.)
             url: URL to request
             **kwargs: Additional arguments to pass to requests
-            
+
         Returns:
             Response object
-            
+
         Raises:
             RuntimeError: If authentication fails after retry
         """
-        response = requests.request(method, url, **kwargs)
-        
+        stale_token = self.token_manager.access_token
+        http = self._tap.transport or self._tap.requests_session
+        response = http.request(method, url, **kwargs)
+
         if response.status_code == 401:
             self.logger.info("Received 401 Unauthorized, refreshing token...")
-            self.update_access_token()
+            self.token_manager.refresh(stale_token=stale_token)
             # Update headers with new token
             if 'headers' in kwargs:
                 kwargs['headers'].update(self.auth_headers)
             else:
                 kwargs['headers'] = self.auth_headers
             # Retry the request with new token
-            response = requests.request(method, url, **kwargs)
-            
+            response = http.request(method, url, **kwargs)
+
             if response.status_code == 401:
                 raise RuntimeError("Authentication failed even after token refresh")
-                
+
         return response
 
     @property
@@ -63,12 +223,8 @@ class BearerTokenAuthenticator(APIAuthenticatorBase):
         Returns:
             HTTP headers for authentication.
         """
-        if not self.is_token_valid():
-            self.update_access_token()
         result = super().auth_headers
-        result[
-            "Authorization"
-        ] = f"Bearer {self._tap._config.get('access_token')}"
+        result["Authorization"] = f"Bearer {self.token_manager.get_token()}"
         return result
 
     @property
@@ -88,19 +244,10 @@ class BearerTokenAuthenticator(APIAuthenticatorBase):
     @property
     def request_body(self) -> dict:
         """Define the OAuth request body for the API."""
-        return {
-            "email": self.config.get("email"),
-            "password": self.config.get("password"),
-            "location_key": self.config.get("location_key"),
-        }
+        return self.token_manager.request_body
 
     def is_token_valid(self) -> bool:
-        now = round(datetime.utcnow().timestamp())
-        created_at = self._tap._config.get(
-            "created_at", 0
-        )
-
-        return now < (created_at + self.expires_in - 60)
+        return self.token_manager.is_token_valid()
 
     # Authentication and refresh
     def update_access_token(self) -> None:
@@ -109,23 +256,4 @@ class BearerTokenAuthenticator(APIAuthenticatorBase):
         Raises:
             RuntimeError: When OAuth login fails.
         """
-        auth_request_payload = self.request_body
-        token_response = requests.post(self.auth_endpoint, data=auth_request_payload)
-        try:
-            token_last_refreshed = round(datetime.utcnow().timestamp())
-            token_response.raise_for_status()
-            self.logger.info("OAuth authorization attempt was successful.")
-            token_json = token_response.json()
-            token = token_json["data"]["token"]
-        except Exception as ex:
-            raise RuntimeError(
-                f"Failed login, response was '{token_response.json()}'. {ex}"
-            )
-        self.access_token = token["jwt_token"]
-        self.expires_in = token["expires_in"]
-
-        self._tap._config["created_at"] = token_last_refreshed
-        self._tap._config["access_token"] = self.access_token
-        self._tap._config["expires_in"] = self.expires_in
-        with open(self._tap.config_file, "w") as outfile:
-            json.dump(self._tap._config, outfile, indent=4)
\ No newline at end of file
+        self.token_manager.refresh(force=True)
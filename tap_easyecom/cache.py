@@ -0,0 +1,150 @@
+"""On-disk cache of API responses, for re-runs and development."""
+import gzip
+import hashlib
+import os
+import threading
+import time
+from typing import Callable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from tap_easyecom.files import atomic_write
+from tap_easyecom.jsonlib import dumps, loads
+
+DEFAULT_CACHE_TTL = 3600
+DEFAULT_CACHE_MAX_SIZE = 1024 * 1024 * 1024
+
+
+def cache_key(namespace: str, method: str, url: str) -> str:
+    """Return the cache key of a request, independent of query parameter order."""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    raw = "\n".join([namespace, method.upper(), parts.path, query])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class ResponseCache:
+    """Successful responses stored as gzip files, one per request.
+
+    Each entry keeps its expiry time, or none for responses that can never
+    change, such as closed date windows. Once the cache grows past
+    `max_size` bytes, the least recently used entries are removed.
+    `namespace` keeps responses of different accounts apart, and the
+    `partition` given with each request those of different locations.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        namespace: str = "",
+        max_size: int = DEFAULT_CACHE_MAX_SIZE,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.directory = directory
+        self.namespace = namespace
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._size = sum(
+            entry.stat().st_size for entry in os.scandir(directory) if entry.is_file()
+        )
+
+    def _path(self, request: requests.PreparedRequest, partition: str) -> str:
+        key = cache_key(f"{self.namespace}|{partition}", request.method, request.url)
+        return os.path.join(self.directory, f"{key}.json.gz")
+
+    def get(
+        self, request: requests.PreparedRequest, partition: str = ""
+    ) -> Optional[requests.Response]:
+        """Return the cached response to `request`, or None."""
+        path = self._path(request, partition)
+        try:
+            with gzip.open(path, "rb") as infile:
+                entry = loads(infile.readline())
+                body = infile.read()
+        except (OSError, ValueError, EOFError):
+            with self._lock:
+                self.misses += 1
+            return None
+        expires_at = entry.get("expires_at")
+        if expires_at is not None and expires_at <= self._clock():
+            with self._lock:
+                self.misses += 1
+            self._remove(path)
+            return None
+        with self._lock:
+            self.hits += 1
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        response = requests.Response()
+        response.status_code = entry["status_code"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.url = request.url
+        response.request = request
+        response.encoding = entry.get("encoding")
+        response._content = body
+        return response
+
+    def put(
+        self,
+        request: requests.PreparedRequest,
+        response: requests.Response,
+        ttl: Optional[float],
+        partition: str = "",
+    ) -> None:
+        """Store `response` for `ttl` seconds, or indefinitely when `ttl` is None."""
+        entry = {
+            "url": request.url,
+            "status_code": response.status_code,
+            "headers": {
+                name: value
+                for name, value in response.headers.items()
+                # The body is stored decoded.
+                if name.lower() not in ("content-encoding", "content-length")
+            },
+            "encoding": response.encoding,
+            "expires_at": None if ttl is None else self._clock() + ttl,
+        }
+        path = self._path(request, partition)
+        data = gzip.compress(dumps(entry) + b"\n" + response.content)
+        with self._lock:
+            self._size -= self._file_size(path)
+            atomic_write(path, data, "wb")
+            self._size += len(data)
+        if self._size > self.max_size:
+            self._evict()
+
+    @staticmethod
+    def _file_size(path: str) -> int:
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+
+    def _remove(self, path: str) -> None:
+        with self._lock:
+            size = self._file_size(path)
+            try:
+                os.unlink(path)
+            except OSError:
+                return
+            self._size -= size
+
+    def _evict(self) -> None:
+        """Remove the least recently used entries until the cache fits."""
+        entries = sorted(
+            (entry for entry in os.scandir(self.directory) if entry.name.endswith(".json.gz")),
+            key=lambda entry: entry.stat().st_mtime,
+        )
+        for entry in entries:
+            if self._size <= self.max_size:
+                break
+            self._remove(entry.path)
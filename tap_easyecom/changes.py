@@ -0,0 +1,73 @@
+"""Change detection for full-table streams."""
+import gzip
+import hashlib
+import os
+from typing import Any, Dict, Hashable, Iterator, List
+
+from tap_easyecom.files import atomic_write
+from tap_easyecom.jsonlib import dumps_sorted, loads
+
+
+def content_hash(record: dict) -> int:
+    """Return a 64-bit hash of a record's content, independent of key order."""
+    digest = hashlib.blake2b(dumps_sorted(record), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class RecordHashStore:
+    """Remembers a content hash per primary key between runs.
+
+    Only a 64-bit hash is kept per record, so the store holds a few dozen
+    bytes per key in memory and on disk (gzip-compressed JSON), whatever
+    the size of the records. The file is replaced on `save`, so a failed
+    run leaves the previous store untouched.
+    """
+
+    def __init__(self, path: str, primary_keys: List[str]) -> None:
+        self.path = path
+        self.primary_keys = primary_keys
+        self._hashes: Dict[Hashable, int] = {}
+        self._seen = set()
+        if os.path.exists(path):
+            with gzip.open(path, "rb") as infile:
+                for key, value in loads(infile.read()):
+                    self._hashes[self._to_key(key)] = value
+
+    @staticmethod
+    def _to_key(key: Any) -> Hashable:
+        return tuple(key) if isinstance(key, list) else key
+
+    def record_key(self, record: dict) -> Hashable:
+        if len(self.primary_keys) == 1:
+            return record.get(self.primary_keys[0])
+        return tuple(record.get(key) for key in self.primary_keys)
+
+    def has_changed(self, record: dict) -> bool:
+        """Return whether `record` is new or differs from the stored version."""
+        key = self.record_key(record)
+        self._seen.add(key)
+        new_hash = content_hash(record)
+        if self._hashes.get(key) == new_hash:
+            return False
+        self._hashes[key] = new_hash
+        return True
+
+    def deleted_keys(self) -> Iterator[Hashable]:
+        """Yield the keys stored by a previous run that were not seen this run."""
+        for key in self._hashes:
+            if key not in self._seen:
+                yield key
+
+    def key_record(self, key: Hashable) -> dict:
+        """Return a record holding only the primary key values of `key`."""
+        values = key if len(self.primary_keys) > 1 else (key,)
+        return dict(zip(self.primary_keys, values))
+
+    def save(self) -> None:
+        """Write the hashes of the records seen this run, dropping deleted ones."""
+        rows = [
+            [list(key) if isinstance(key, tuple) else key, value]
+            for key, value in self._hashes.items()
+            if key in self._seen
+        ]
+        atomic_write(self.path, gzip.compress(dumps_sorted(rows)), "wb")
@@ -1,42 +1,157 @@
 """REST client handling, including EasyEcomStream base class."""
 from typing import Callable, Iterable
-from singer_sdk.exceptions import RetriableAPIError
-from urllib.parse import urlparse, parse_qs
+from singer_sdk.exceptions import ConfigValidationError, RetriableAPIError
+from urllib.parse import urlparse, parse_qs, parse_qsl
 from functools import cached_property
-import singer
-from singer import StateMessage
+import asyncio
+import copy
+import math
+import os
+import queue
+import threading
+import time
+from singer import RecordMessage
+from singer_sdk.helpers.jsonpath import extract_jsonpath
 from singer_sdk.streams import RESTStream
 
 from tap_easyecom.auth import BearerTokenAuthenticator
+from tap_easyecom.cache import DEFAULT_CACHE_TTL
+from tap_easyecom.changes import RecordHashStore
+from tap_easyecom.conform import compile_record_conformer, deselected_paths
+from tap_easyecom.dedup import DEFAULT_DEDUP_CACHE_SIZE, RecentKeys
+from tap_easyecom.jsonlib import compile_records_path, extract_records, response_json
+from tap_easyecom.pagesize import DEFAULT_MAX_PAGE_SIZE, detect_page_size
+from tap_easyecom.resilience import CircuitOpenError, Deadline, DeadlineExceeded
+from tap_easyecom.windows import (
+    DateWindow,
+    WindowCursor,
+    WindowSizer,
+    map_in_order,
+    split_windows,
+)
+from datetime import datetime, timedelta
 from pendulum import parse
+import pytz
 import backoff
 import requests
 
+THROTTLE_RETRIES = 10
+REQUEST_TRIES = 10
+RETRIABLE_ERRORS = (
+    RetriableAPIError,
+    requests.exceptions.ReadTimeout,
+    requests.exceptions.ConnectionError,
+)
+# Streams whose partition bookmarks are reset in every STATE message.
+RESET_PARTITIONS_STREAMS = ("gl_entries_dimensions",)
+_LAST_PAGE = object()
+
+
 class EasyEcomStream(RESTStream):
     """EasyEcom stream class."""
 
     records_jsonpath = "$.data[*]"
-    # limit is maxed out at 10 :/
     page_size = 10
+    # Full-table streams that can skip unchanged records when
+    # `skip_unchanged_records` is enabled.
+    detect_changes = False
+    # Properties identifying one version of a record, to emit it once per run.
+    dedup_keys = None
+    # Query parameters that only add the listed properties to responses.
+    param_properties = {}
+    _checkpoint_pages = 0
+    _last_checkpoint = None
+    _page_size_detected = False
+    _stream_deadline = Deadline()
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.skip_unchanged = bool(
+            self.detect_changes and self.config.get("skip_unchanged_records")
+        )
+        if self.skip_unchanged and self.config.get("emit_tombstones"):
+            self._add_property(
+                "_sdc_deleted_at", {"type": ["string", "null"], "format": "date-time"}
+            )
+        if self.config.get("location_keys"):
+            # Records of different locations can share ids.
+            self._add_property("location_key", {"type": ["string", "null"]})
+            if "location_key" not in self.primary_keys:
+                self.primary_keys = [*self.primary_keys, "location_key"]
+
+    def _param_selected(self, param: str) -> bool:
+        """Return whether any property fed by a query parameter is selected."""
+        properties = self.param_properties.get(param)
+        if properties is None:
+            return True
+        return any(self.mask.get(("properties", name), True) for name in properties)
+
+    @cached_property
+    def _conform_record(self):
+        """Compile the conformer once the catalog's selection is known.
+
+        Deselected properties, nested ones included, are dropped along with
+        unmapped ones, in the same pass and before any value is conformed.
+        """
+        return compile_record_conformer(
+            self.schema, self.name, self.logger, deselected_paths(self.schema, self.mask)
+        )
+
+    def _add_property(self, name: str, schema: dict) -> None:
+        if name not in self.schema["properties"]:
+            self.schema = {
+                **self.schema,
+                "properties": {**self.schema["properties"], name: schema},
+            }
+
+    @property
+    def partitions(self):
+        """Sync each configured location as its own partition."""
+        location_keys = self.config.get("location_keys")
+        if not location_keys:
+            return None
+        return [{"location_key": location_key} for location_key in location_keys]
+
+    def for_partition(self):
+        """Return a copy of the stream to sync one partition on its own thread."""
+        return copy.copy(self)
+
+    def post_process(self, row: dict, context=None) -> dict:
+        if context and "location_key" in context and not row.get("location_key"):
+            row["location_key"] = context["location_key"]
+        return row
 
     def get_next_page_token(
         self, response, previous_token
     ):
         """Return a token for identifying next page or None if no more pages."""
-        res_json = response.json()
+        next_url = self._next_url(response)
+
+        if next_url:
+            return parse_qs(urlparse(next_url).query)['cursor']
+
+        return None
+
+    def _next_url(self, response):
+        """Return the `nextUrl` of a response, wherever the envelope puts it."""
+        res_json = response_json(response)
         next_url = res_json.get("nextUrl")
 
         if not next_url and isinstance(res_json.get("data", {}), dict):
             next_url = res_json.get("data", {}).get("nextUrl")
 
-        if next_url:
-            return parse_qs(urlparse(next_url).query)['cursor']
+        return next_url
 
+    def _next_cursor(self, response):
+        """Return the cursor of the next page as a string, or None."""
+        next_url = self._next_url(response)
+        if next_url:
+            return parse_qs(urlparse(next_url).query)['cursor'][0]
         return None
 
     @property
     def url_base(self) -> str:
-        return "https://api.easyecom.io"
+        return self.config.get("api_url", "https://api.easyecom.io")
 
     @cached_property
     def authenticator(self) -> BearerTokenAuthenticator:
@@ -44,6 +159,46 @@ class EasyEcomStream(RESTStream):
             self, self._tap.config, f"{self.url_base}/access/token"
         )
 
+    def get_authenticator(self, context) -> BearerTokenAuthenticator:
+        """Return the authenticator holding the token of the context's location."""
+        location_key = (context or {}).get("location_key")
+        if location_key is None:
+            return self.authenticator
+        authenticator = self._location_authenticators.get(location_key)
+        if authenticator is None:
+            authenticator = self._location_authenticators.setdefault(
+                location_key,
+                BearerTokenAuthenticator(
+                    self, self._tap.config, f"{self.url_base}/access/token", location_key
+                ),
+            )
+        return authenticator
+
+    @cached_property
+    def _location_authenticators(self) -> dict:
+        return {}
+
+    def prepare_request(self, context, next_page_token) -> requests.PreparedRequest:
+        headers = self.http_headers
+        authenticator = self.get_authenticator(context)
+        headers.update(authenticator.auth_headers or {})
+        params = self.get_url_params(context, next_page_token)
+        params.update(authenticator.auth_params or {})
+        return self.requests_session.prepare_request(
+            requests.Request(
+                method=self.rest_method,
+                url=self.get_url(context),
+                params=params,
+                headers=headers,
+                json=self.prepare_request_payload(context, next_page_token),
+            )
+        )
+
+    @property
+    def requests_session(self) -> requests.Session:
+        """Return the pooled session shared by the whole tap."""
+        return self._tap.requests_session
+
     @property
     def http_headers(self) -> dict:
         headers = {}
@@ -52,6 +207,9 @@ class EasyEcomStream(RESTStream):
         return headers
 
     def get_starting_time(self, context):
+        checkpoint = self._get_checkpoint(context)
+        if checkpoint.get("window_start"):
+            return parse(checkpoint["window_start"])
         start_date = self.config.get("start_date")
         if start_date:
             start_date = parse(self.config.get("start_date"))
@@ -65,41 +223,765 @@ class EasyEcomStream(RESTStream):
         if self.page_size:
             params["limit"] = self.page_size
         if hasattr(self, "additional_params"):
-            params.update(self.additional_params)
+            params.update(
+                (param, value)
+                for param, value in self.additional_params.items()
+                if self._param_selected(param)
+            )
         if self.replication_key:
             start_date = self.get_starting_time(context)
             date_filter = self.date_filter_param if hasattr(self, "date_filter_param") else "updated_after"
             params[date_filter] = start_date.strftime('%Y-%m-%d %H:%M:%S')
         return params
 
-    def _write_state_message(self) -> None:
-        """Write out a STATE message with the latest state."""
-        tap_state = self.tap_state
+    def _write_state_message(self, force: bool = False) -> None:
+        """Write out a STATE message with the latest state.
+
+        The message writer may coalesce it with later ones, unless `force`
+        is set; `_sync_records` always ends with the stream's latest state.
+        """
+        with self._tap.message_writer.lock:
+            tap_state = self.tap_state
+            bookmarks = tap_state.get("bookmarks") if tap_state else None
+            if bookmarks:
+                for stream_name in RESET_PARTITIONS_STREAMS:
+                    if bookmarks.get(stream_name, {}).get("partitions"):
+                        bookmarks[stream_name] = {"partitions": []}
+
+            self._tap.message_writer.write_state(tap_state, force=force)
+
+    def _sync_records(self, context=None) -> None:
+        """Sync records, then write any state coalesced along the way.
 
-        if tap_state and tap_state.get("bookmarks"):
-            for stream_name in tap_state.get("bookmarks").keys():
-                if stream_name in [
-                    "gl_entries_dimensions",
-                ] and tap_state["bookmarks"][stream_name].get("partitions"):
-                    tap_state["bookmarks"][stream_name] = {"partitions": []}
+        This also runs when the sync fails, so the target still receives
+        the records and state written before the error.
+        """
+        try:
+            super()._sync_records(context)
+        finally:
+            self.flush_output()
 
-        singer.write_message(StateMessage(value=tap_state))
+    def flush_output(self) -> None:
+        """Close the stream's batch files and write any coalesced state."""
+        message_writer = self._tap.message_writer
+        with message_writer.lock:
+            for stream_map in self.stream_maps:
+                message_writer.close_batch_file(stream_map.stream_alias)
+            message_writer.flush_state()
+
+    def _write_replication_key_signpost(self, context, value) -> None:
+        with self._tap.message_writer.lock:
+            super()._write_replication_key_signpost(context, value)
+
+    def _write_schema_message(self) -> None:
+        with self._tap.message_writer.lock:
+            self._tap.message_writer.flush()
+            super()._write_schema_message()
+
+    def _generate_record_messages(self, record: dict):
+        record = self._conform_record(record)
+        for stream_map in self.stream_maps:
+            mapped_record = stream_map.transform(record)
+            # Emit record if not filtered
+            if mapped_record is not None:
+                yield RecordMessage(
+                    stream=stream_map.stream_alias,
+                    record=mapped_record,
+                    version=None,
+                    time_extracted=pytz.utc.localize(datetime.utcnow()),
+                )
+
+    def _write_record_message(self, record: dict) -> None:
+        message_writer = self._tap.message_writer
+        with message_writer.lock:
+            for record_message in self._generate_record_messages(record):
+                if message_writer.batch_dir:
+                    message_writer.write_batch_record(
+                        record_message.stream, record_message.record
+                    )
+                else:
+                    message_writer.write_message(record_message)
+
+    def _increment_stream_state(self, latest_record, *, context=None) -> None:
+        with self._tap.message_writer.lock:
+            super()._increment_stream_state(latest_record, context=context)
+
+    def _request(self, prepared_request, context):
+        """Send a request, refreshing the shared token once on a 401.
+
+        With a response cache configured, cached responses are returned
+        without a request, and valid responses are cached for `_cache_ttl`.
+        """
+        response = self._cached_response(prepared_request, context)
+        if response is None:
+            response = self._send(prepared_request)
+            if response.status_code == 401:
+                self._refresh_token(prepared_request, context)
+                response = self._send(prepared_request)
+            self._accept_response(prepared_request, context, response)
+        self._tap.metrics.observe_page(
+            self.name, self.path, sum(1 for _ in self.parse_response(response))
+        )
+        return response
+
+    async def _request_async(self, prepared_request, context):
+        """Like `_request`, but sends through the tap's async transport."""
+        response = self._cached_response(prepared_request, context)
+        if response is None:
+            response = await self._send_async(prepared_request)
+            if response.status_code == 401:
+                # Logging in blocks, so keep it off the event loop.
+                await asyncio.get_running_loop().run_in_executor(
+                    None, self._refresh_token, prepared_request, context
+                )
+                response = await self._send_async(prepared_request)
+            self._accept_response(prepared_request, context, response)
+        self._tap.metrics.observe_page(
+            self.name, self.path, sum(1 for _ in self.parse_response(response))
+        )
+        return response
+
+    def _cached_response(self, prepared_request, context):
+        cache = self._tap.response_cache
+        if not cache:
+            return None
+        return cache.get(prepared_request, (context or {}).get("location_key") or "")
+
+    def _refresh_token(self, prepared_request, context) -> None:
+        """Replace the token a request was sent with after a 401."""
+        self.logger.info("Received 401 Unauthorized, refreshing token...")
+        authenticator = self.get_authenticator(context)
+        stale_token = prepared_request.headers.get("Authorization", "")
+        authenticator.token_manager.refresh(stale_token=stale_token[len("Bearer "):])
+        prepared_request.headers.update(authenticator.auth_headers)
+
+    def _accept_response(self, prepared_request, context, response) -> None:
+        """Validate a response and cache it if it may be cached."""
+        self.validate_response(response)
+        cache = self._tap.response_cache
+        if cache:
+            ttl = self._cache_ttl(prepared_request)
+            if ttl != 0:
+                location_key = (context or {}).get("location_key") or ""
+                cache.put(prepared_request, response, ttl, location_key)
+
+    def _cache_ttl(self, prepared_request):
+        """Return how long to cache a response in seconds, None for ever or 0 for never.
+
+        A date filter without an upper bound covers changes made until the
+        request is answered, so such responses are never cached.
+        """
+        if self.replication_key:
+            params = dict(parse_qsl(urlparse(prepared_request.url).query))
+            date_filter = getattr(self, "date_filter_param", "updated_after")
+            if date_filter in params:
+                return 0
+        return self.config.get("response_cache_ttl", DEFAULT_CACHE_TTL)
+
+    def backoff_handler(self, details) -> None:
+        self._tap.metrics.observe_retry(self.name, self.path, details.get("wait") or 0)
+        super().backoff_handler(details)
+
+    def _send(self, prepared_request):
+        """Send a request paced by the tap-wide rate limiter.
+
+        429 responses are retried here after the limiter's pause instead of
+        going through the exponential backoff in `request_decorator`.
+        """
+        transport = self._tap.transport
+        timeout = self.config.get("request_timeout", 300)
+        for attempt in range(THROTTLE_RETRIES):
+            self._check_budget()
+            waited = self._tap.rate_limiter.acquire()
+            started = time.perf_counter()
+            try:
+                if transport:
+                    response = transport.send(prepared_request, timeout)
+                else:
+                    response = self.requests_session.send(prepared_request, timeout=timeout)
+            except requests.exceptions.RequestException:
+                self._tap.circuit_breaker.record_failure(self.path)
+                raise
+            if not self._throttled(response, attempt, waited, started):
+                break
+        return response
+
+    async def _send_async(self, prepared_request):
+        """Like `_send`, but waits for the rate limiter without blocking the loop."""
+        timeout = self.config.get("request_timeout", 300)
+        for attempt in range(THROTTLE_RETRIES):
+            self._check_budget()
+            waited = self._tap.rate_limiter.reserve()
+            if waited > 0:
+                await asyncio.sleep(waited)
+            started = time.perf_counter()
+            try:
+                response = await self._tap.transport.send_async(prepared_request, timeout)
+            except requests.exceptions.RequestException:
+                self._tap.circuit_breaker.record_failure(self.path)
+                raise
+            if not self._throttled(response, attempt, waited, started):
+                break
+        return response
+
+    def _check_budget(self) -> None:
+        """Refuse to send once the time budget is spent or the circuit is open."""
+        if self._remaining_budget() == 0:
+            raise DeadlineExceeded(f"The time budget of {self.name} is spent.")
+        self._tap.circuit_breaker.check(self.path)
+
+    def _remaining_budget(self):
+        """Return the seconds left of the sync's and the stream's budgets, or None."""
+        remaining = min(
+            self._tap.sync_deadline.remaining(), self._stream_deadline.remaining()
+        )
+        return None if remaining == math.inf else remaining
+
+    def _throttled(self, response, attempt, waited, started) -> bool:
+        """Record a response's metrics and pace; return whether it was a 429."""
+        if response.status_code >= 500:
+            self._tap.circuit_breaker.record_failure(self.path)
+        else:
+            self._tap.circuit_breaker.record_success(self.path)
+        metrics = self._tap.metrics
+        if attempt:
+            metrics.observe_retry(self.name, self.path, waited)
+        metrics.observe_request(
+            self.name,
+            self.path,
+            time.perf_counter() - started,
+            response.status_code,
+            len(response.content),
+        )
+        rate_limiter = self._tap.rate_limiter
+        rate_limiter.observe(response)
+        if response.status_code != 429:
+            return False
+        self.logger.info(
+            f"Throttled by EasyEcom, slowing down to {rate_limiter.rate:.2f} requests/s."
+        )
+        return True
 
     def request_decorator(self, func: Callable) -> Callable:
         decorator: Callable = backoff.on_exception(
             self.backoff_wait_generator,
-            (
-                RetriableAPIError,
-                requests.exceptions.ReadTimeout,
-                requests.exceptions.ConnectionError,
-            ),
-            max_tries=10,
+            RETRIABLE_ERRORS,
+            max_tries=REQUEST_TRIES,
+            # Retries never wait past the end of the time budget.
+            max_time=self._remaining_budget,
             on_backoff=self.backoff_handler,
+            on_giveup=self._giveup_handler,
         )(func)
         return decorator
-    
+
+    async def _request_with_retries_async(self, prepared_request, context):
+        """Like `request_decorator(self._request_async)`, retrying on the event loop.
+
+        backoff 1.x, which the SDK pins, runs the handlers of coroutines
+        through `asyncio.coroutine`, which Python 3.11 removed.
+        """
+        wait = self.backoff_wait_generator()
+        max_time = self._remaining_budget()
+        started = time.monotonic()
+        tries = 0
+        while True:
+            tries += 1
+            try:
+                return await self._request_async(prepared_request, context)
+            except RETRIABLE_ERRORS:
+                elapsed = time.monotonic() - started
+                details = {
+                    "target": self._request_async,
+                    "args": (prepared_request, context),
+                    "kwargs": {},
+                    "tries": tries,
+                    "elapsed": elapsed,
+                }
+                if tries >= REQUEST_TRIES or (
+                    max_time is not None and elapsed >= max_time
+                ):
+                    self._giveup_handler(details)
+                    raise
+                seconds = backoff.full_jitter(next(wait))
+                if max_time is not None:
+                    seconds = min(seconds, max_time - elapsed)
+                details["wait"] = seconds
+                self.backoff_handler(details)
+                await asyncio.sleep(seconds)
+
+    def _giveup_handler(self, details) -> None:
+        if details["tries"] < REQUEST_TRIES:
+            raise DeadlineExceeded(
+                f"The time budget of {self.name} ran out while retrying."
+            )
+
+    def request_records(self, context):
+        """Request records, optionally prefetching pages in the background."""
+        self._detect_page_size(context)
+        prefetch_pages = self.config.get("prefetch_pages", 0)
+        if prefetch_pages > 0:
+            pages = self._prefetch_pages(context, prefetch_pages)
+        else:
+            pages = self._iter_pages(context)
+        for response, checkpoint in pages:
+            yield from self.parse_response(response)
+            self._save_checkpoint(context, checkpoint)
+
+    def _detect_page_size(self, context) -> None:
+        """Page at the largest limit the endpoint accepts, when enabled.
+
+        Detected sizes are kept in the tap's page size store, so an endpoint
+        is probed again only once its entry is older than `page_size_ttl`.
+        """
+        store = self._tap.page_size_store
+        if store is None or self._page_size_detected:
+            return
+        self._page_size_detected = True
+        endpoint = f"{self.url_base}{self.path}"
+        page_size = store.get(endpoint)
+        if page_size is None:
+            try:
+                page_size = detect_page_size(
+                    lambda limit: self._probe_page_size(context, limit),
+                    self.config.get("max_page_size", DEFAULT_MAX_PAGE_SIZE),
+                    self.page_size,
+                )
+            except Exception as ex:
+                self.logger.warning(f"Could not detect the page size of {endpoint}: {ex}")
+                return
+            if page_size is None:
+                return
+            store.set(endpoint, page_size)
+            self.logger.info(f"Detected page size {page_size} for {endpoint}.")
+        self.page_size = page_size
+
+    def _probe_page_size(self, context, limit):
+        """Request one page of `limit` records for `detect_page_size`."""
+        authenticator = self.get_authenticator(context)
+        prepared_request = self.requests_session.prepare_request(
+            requests.Request(
+                method=self.rest_method,
+                url=self.get_url(context),
+                params={
+                    **self._probe_params(context),
+                    **(authenticator.auth_params or {}),
+                    "limit": limit,
+                },
+                headers={**self.http_headers, **(authenticator.auth_headers or {})},
+            )
+        )
+        response = self._send(prepared_request)
+        if 400 <= response.status_code < 500 and response.status_code not in (401, 403, 429):
+            return None
+        self.validate_response(response)
+        records = sum(1 for _ in self.parse_response(response))
+        return records, bool(self._next_url(response))
+
+    def _probe_params(self, context) -> dict:
+        return self.get_url_params(context, None)
+
+    def _get_checkpoint(self, context) -> dict:
+        return self.get_context_state(context).get("checkpoint") or {}
+
+    def _save_checkpoint(self, context, checkpoint) -> None:
+        """Record where to resume once every record before it was written.
+
+        The checkpoint is written every `checkpoint_interval` pages and
+        cleared after the last page, so an interrupted sync continues from
+        the last checkpointed page instead of the bookmark.
+        """
+        state = self.get_context_state(context)
+        with self._tap.message_writer.lock:
+            self._last_checkpoint = checkpoint
+            if checkpoint is None:
+                state.pop("checkpoint", None)
+                return
+            interval = self.config.get("checkpoint_interval", 0)
+            # Change detection needs to see every record of a full sync.
+            if interval <= 0 or self.skip_unchanged:
+                return
+            self._checkpoint_pages += 1
+            if self._checkpoint_pages % interval == 0:
+                state["checkpoint"] = checkpoint
+                self._write_state_message(force=True)
+
+    def _page_checkpoint(self, context, next_page_token):
+        """Return the checkpoint to resume at `next_page_token`, or None."""
+        if not next_page_token:
+            return None
+        checkpoint = {"cursor": next_page_token[0]}
+        if self.replication_key:
+            # The cursor is only valid with the date filter it was issued for.
+            checkpoint["window_start"] = self.get_starting_time(context).isoformat()
+        return checkpoint
+
+    def _resume_token(self, context):
+        """Return the page token of the checkpointed page, if there is one."""
+        cursor = self._get_checkpoint(context).get("cursor")
+        if cursor:
+            self.logger.info(f"Resuming {self.name} at checkpointed cursor {cursor}.")
+            return [cursor]
+        return None
+
+    def _iter_pages(self, context):
+        """Yield every page's response with the checkpoint to resume after it."""
+        decorated_request = self.request_decorator(self._request)
+        next_page_token = self._resume_token(context)
+        while True:
+            prepared_request = self.prepare_request(
+                context, next_page_token=next_page_token
+            )
+            response = decorated_request(prepared_request, context)
+            self.update_sync_costs(prepared_request, response, context)
+            previous_token = copy.deepcopy(next_page_token)
+            next_page_token = self.get_next_page_token(response, previous_token)
+            yield response, self._page_checkpoint(context, next_page_token)
+            if next_page_token and next_page_token == previous_token:
+                raise RuntimeError(
+                    f"Loop detected in pagination. "
+                    f"Pagination token {next_page_token} is identical to prior token."
+                )
+            if not next_page_token:
+                break
+
+    def _prefetch_pages(self, context, max_pages):
+        """Yield pages fetched by a background thread, up to `max_pages` ahead.
+
+        The fetcher reads the next cursor as soon as a response arrives, so
+        the next request is already in flight while the current page's
+        records are parsed and written.
+        """
+        pages = queue.Queue(maxsize=max_pages)
+        stop = threading.Event()
+
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def fetch() -> None:
+            try:
+                for page in self._iter_pages(context):
+                    if not put(page):
+                        return
+            except Exception as ex:
+                put(ex)
+                return
+            put(_LAST_PAGE)
+
+        fetcher = threading.Thread(
+            target=fetch, name=f"{self.name}-prefetch", daemon=True
+        )
+        fetcher.start()
+        try:
+            while True:
+                item = pages.get()
+                if item is _LAST_PAGE:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            fetcher.join()
+
+    def get_records(self, context):
+        """Return records, ending the stream early once its time budget is spent.
+
+        The stream also ends early when its endpoint's circuit opens. Its
+        progress is then dropped, so the bookmark stays where the last
+        complete sync left it, and the page after the last one written is
+        checkpointed, so the next run continues from there.
+        """
+        self._stream_deadline = Deadline(self.config.get("stream_time_budget"))
+        self._last_checkpoint = None
+        records = self._get_records(context)
+        if self.dedup_keys:
+            records = self._drop_duplicates(records)
+        try:
+            yield from records
+        except (DeadlineExceeded, CircuitOpenError) as ex:
+            self.logger.warning(f"Ending {self.name} early: {ex}")
+            with self._tap.message_writer.lock:
+                state = self.get_context_state(context)
+                state.pop("progress_markers", None)
+                if self._last_checkpoint and not self.skip_unchanged:
+                    state["checkpoint"] = self._last_checkpoint
+
+    def _drop_duplicates(self, records):
+        """Skip record versions already emitted, remembering the most recent ones."""
+        recent_keys = RecentKeys(
+            self.config.get("dedup_cache_size", DEFAULT_DEDUP_CACHE_SIZE)
+        )
+        try:
+            for record in records:
+                key = tuple(record.get(name) for name in self.dedup_keys)
+                if not recent_keys.seen(key):
+                    yield record
+        finally:
+            self._tap.metrics.observe_duplicates(
+                self.name, self.path, recent_keys.duplicates
+            )
+            self.logger.info(
+                f"Dropped {recent_keys.duplicates} duplicate {self.name} records."
+            )
+
+    def _get_records(self, context):
+        """Return records, skipping unchanged ones when change detection is on."""
+        records = super().get_records(context)
+        if not self.skip_unchanged:
+            yield from records
+            return
+
+        file_name = self.name
+        if context and "location_key" in context:
+            file_name = f"{self.name}-{context['location_key']}"
+        change_store = RecordHashStore(
+            os.path.join(
+                self.config.get("change_store_dir", ".easyecom"),
+                f"{file_name}.json.gz",
+            ),
+            self.primary_keys,
+        )
+        unchanged = 0
+        for record in records:
+            if change_store.has_changed(record):
+                yield record
+            else:
+                unchanged += 1
+        deleted = 0
+        if self.config.get("emit_tombstones"):
+            deleted_at = pytz.utc.localize(datetime.utcnow()).isoformat()
+            for key in change_store.deleted_keys():
+                deleted += 1
+                yield {
+                    **change_store.key_record(key),
+                    "_sdc_deleted_at": deleted_at,
+                }
+        change_store.save()
+        self.logger.info(
+            f"Skipped {unchanged} unchanged records, emitted {deleted} tombstones."
+        )
+
+    @cached_property
+    def _records_path(self):
+        return compile_records_path(self.records_jsonpath)
+
     def parse_response(self, response) -> Iterable[dict]:
-        if response.json().get("data") == "No Data Found":
+        res_json = response_json(response)
+        if res_json.get("data") == "No Data Found":
             yield from []
+        elif self._records_path is None:
+            yield from extract_jsonpath(self.records_jsonpath, input=res_json)
         else:
-            yield from super().parse_response(response)
\ No newline at end of file
+            yield from extract_records(res_json, self._records_path)
+
+
+class DateWindowStream(EasyEcomStream):
+    """Incremental stream fetched in bounded date windows.
+
+    The API only returns records inside a `window_after_param` to
+    `window_before_param` range, so the stream walks from the bookmark to
+    now one window at a time and follows the cursor inside each window.
+    """
+
+    window_after_param = "updated_after"
+    window_before_param = "updated_before"
+    window_size = timedelta(days=7)
+    start_date = None
+    end_date = None
+    today = None
+    window_sizer = None
+    _window_pages = 0
+    _window_records = 0
+
+    def get_starting_time(self, context):
+        """Return where the first window starts, which needs a start date."""
+        start_date = super().get_starting_time(context)
+        if start_date is None:
+            raise ConfigValidationError(
+                f"{self.name} is fetched in date windows from its bookmark, "
+                "set `start_date` to sync it for the first time."
+            )
+        return start_date
+
+    def get_next_page_token(self, response, previous_token):
+        self._window_pages += 1
+        self._window_records += sum(1 for _ in self.parse_response(response))
+        next_page_token = super().get_next_page_token(response, previous_token)
+        if next_page_token:
+            next_page_token = next_page_token[0]
+        if not next_page_token and self.end_date and self.today and self.end_date < self.today:
+            return f"iterate_{self.start_date}"
+        return next_page_token
+
+    def get_url_params(self, context, next_page_token):
+        if isinstance(next_page_token, WindowCursor):
+            return self._window_params(next_page_token.window, next_page_token.cursor)
+
+        cursor = None
+        if next_page_token and not next_page_token.startswith("iterate"):
+            cursor = next_page_token
+
+        # Initialize today, start_date and end_date
+        if self.start_date is None:
+            self._init_windows(context)
+
+        # move to the next date chunk
+        if next_page_token and next_page_token.startswith("iterate"):
+            window_size = self.window_sizer.next_size(
+                self._window_pages, self._window_records
+            )
+            self.logger.info(
+                f"Window {self.start_date} - {self.end_date} returned "
+                f"{self._window_records} records in {self._window_pages} pages, "
+                f"next window size is {window_size}."
+            )
+            self.start_date = self.end_date - timedelta(seconds=1)
+            self.end_date = self.start_date + window_size + timedelta(seconds=1)
+
+        if not cursor:
+            self._window_pages = 0
+            self._window_records = 0
+
+        return self._window_params(DateWindow(self.start_date, self.end_date), cursor)
+
+    def _init_windows(self, context):
+        """Start at the bookmark, or inside the checkpointed window."""
+        self.window_sizer = WindowSizer(
+            self.window_size,
+            min_size=timedelta(days=self.config.get("window_min_days", 1)),
+            max_size=timedelta(days=self.config.get("window_max_days", 31)),
+            max_pages=self.config.get("window_max_pages", 20),
+            page_size=self.page_size,
+        )
+        self.today = pytz.utc.localize(datetime.utcnow())
+        self.start_date = self.get_starting_time(context)
+        window_end = self._get_checkpoint(context).get("window_end")
+        if window_end:
+            self.end_date = parse(window_end)
+        else:
+            self.end_date = self.start_date + self.window_sizer.size
+
+    def _probe_params(self, context) -> dict:
+        start_date = self.get_starting_time(context)
+        return self._window_params(DateWindow(start_date, start_date + self.window_size))
+
+    def _page_checkpoint(self, context, next_page_token):
+        if not next_page_token:
+            return None
+        if next_page_token.startswith("iterate"):
+            # The next window starts where get_url_params will move it to.
+            window_start = self.end_date - timedelta(seconds=1)
+            return {"window_start": window_start.isoformat()}
+        return {
+            "window_start": self.start_date.isoformat(),
+            "window_end": self.end_date.isoformat(),
+            "cursor": next_page_token,
+        }
+
+    def _cache_ttl(self, prepared_request):
+        """Cache closed windows for ever and never cache one ending today."""
+        params = dict(parse_qsl(urlparse(prepared_request.url).query))
+        window_end = params.get(self.window_before_param)
+        if not window_end:
+            if self.window_after_param in params:
+                # Open-ended, like the incremental requests of other streams.
+                return 0
+            return super()._cache_ttl(prepared_request)
+        today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        if datetime.strptime(window_end, '%Y-%m-%d %H:%M:%S') < today:
+            return None
+        return 0
+
+    def _resume_token(self, context):
+        token = super()._resume_token(context)
+        return token[0] if token else None
+
+    def _window_params(self, window, cursor=None):
+        params = dict()
+        if self.page_size:
+            params["limit"] = self.page_size
+        if cursor:
+            params["cursor"] = cursor
+        params[self.window_after_param] = window.start.strftime('%Y-%m-%d %H:%M:%S')
+        params[self.window_before_param] = window.end.strftime('%Y-%m-%d %H:%M:%S')
+        return params
+
+    def request_records(self, context):
+        """Request records, fetching several date windows at once if configured.
+
+        Windows are split up front and paged on a worker pool, but their
+        records are yielded strictly in window order, so the bookmark never
+        moves past a window that has not been fully fetched.
+        """
+        self._detect_page_size(context)
+        # Every partition walks its own windows from its own bookmark.
+        self.start_date = None
+        window_workers = self.config.get("window_workers", 1)
+        if window_workers <= 1:
+            yield from super().request_records(context)
+            return
+
+        today = pytz.utc.localize(datetime.utcnow())
+        windows = split_windows(self.get_starting_time(context), today, self.window_size)
+        self.logger.info(
+            f"Fetching {len(windows)} date windows with {window_workers} workers."
+        )
+        if self._tap.transport:
+            # Windows run as coroutines on the transport's event loop.
+            results = self._tap.transport.map_in_order(
+                lambda window: self._request_window_async(context, window),
+                windows,
+                window_workers,
+            )
+        else:
+            results = map_in_order(
+                lambda window: list(self._request_window(context, window)),
+                windows,
+                window_workers,
+            )
+        for index, (window, records) in enumerate(results):
+            self.logger.info(
+                f"Fetched {len(records)} records for window "
+                f"{window.start} - {window.end}."
+            )
+            yield from records
+            next_window = windows[index + 1] if index + 1 < len(windows) else None
+            self._save_checkpoint(
+                context,
+                next_window and {"window_start": next_window.start.isoformat()},
+            )
+
+    def _request_window(self, context, window):
+        """Page through every cursor of a single date window."""
+        decorated_request = self.request_decorator(self._request)
+        next_page_token = WindowCursor(window)
+        while next_page_token:
+            prepared_request = self.prepare_request(
+                context, next_page_token=next_page_token
+            )
+            response = decorated_request(prepared_request, context)
+            yield from self.parse_response(response)
+            cursor = self._next_cursor(response)
+            next_page_token = WindowCursor(window, cursor) if cursor else None
+
+    async def _request_window_async(self, context, window):
+        """Return the records of every cursor of a single date window."""
+        loop = asyncio.get_running_loop()
+        records = []
+        next_page_token = WindowCursor(window)
+        while next_page_token:
+            # Preparing may log in, which waits on this loop through the transport.
+            prepared_request = await loop.run_in_executor(
+                None, self.prepare_request, context, next_page_token
+            )
+            response = await self._request_with_retries_async(prepared_request, context)
+            records.extend(self.parse_response(response))
+            cursor = self._next_cursor(response)
+            next_page_token = WindowCursor(window, cursor) if cursor else None
+        return records
@@ -0,0 +1,169 @@
+"""Per-stream record conformance compiled from the stream schema."""
+import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+Conformer = Callable[[Any], Any]
+# The names leading to a property, such as ("documents", "label").
+PropertyPath = Tuple[str, ...]
+
+_JSON_SCALARS = (str, int, float, type(None))
+
+
+def _types(schema: dict) -> set:
+    schema_type = schema.get("type", [])
+    if isinstance(schema_type, str):
+        return {schema_type}
+    types = set(schema_type)
+    for option in schema.get("anyOf", []):
+        types |= _types(option)
+    return types
+
+
+def to_json_value(value: Any) -> Any:
+    """Convert a non-JSON scalar the same way the SDK does."""
+    if isinstance(value, datetime.datetime):
+        if not value.tzinfo:
+            value = value.replace(tzinfo=datetime.timezone.utc)
+        return value.isoformat()
+    if isinstance(value, datetime.date):
+        return value.isoformat() + "T00:00:00+00:00"
+    if isinstance(value, datetime.timedelta):
+        epoch = datetime.datetime.utcfromtimestamp(0)
+        return (epoch + value).isoformat() + "+00:00"
+    if isinstance(value, datetime.time):
+        return str(value)
+    if isinstance(value, bytes):
+        return value.hex()
+    return value
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, _JSON_SCALARS):
+        return value
+    return to_json_value(value)
+
+
+def _boolean(value: Any) -> Optional[bool]:
+    if value is None:
+        return None
+    if isinstance(value, bytes):
+        return value != b"\x00"
+    return value != 0
+
+
+def compile_property(
+    schema: dict,
+    deselected: Iterable[PropertyPath] = (),
+    on_unmapped: Optional[Callable[[PropertyPath], None]] = None,
+    path: PropertyPath = (),
+) -> Optional[Conformer]:
+    """Return the conformer for the property at `path`, or None to pass values through.
+
+    `deselected` are the paths of nested properties to drop from objects.
+    """
+    types = _types(schema)
+    if "boolean" in types and not types & {"string", "number", "integer"}:
+        return _boolean
+    if "object" in types and schema.get("properties") and "array" not in types:
+        return compile_object(schema["properties"], on_unmapped, deselected, path)
+    if "array" in types and "object" not in types:
+        item_conformer = compile_property(
+            schema.get("items", {}), on_unmapped=on_unmapped, path=path
+        )
+        if item_conformer is None:
+            return None
+
+        def conform_array(value: Any) -> Any:
+            if not isinstance(value, list):
+                return value
+            return [item_conformer(item) for item in value]
+
+        return conform_array
+    if types & {"object", "array"}:
+        # Free-form values, such as `custom_fields`, are emitted as they are.
+        return None
+    return _plain
+
+
+def compile_object(
+    properties: Dict[str, dict],
+    on_unmapped: Optional[Callable[[PropertyPath], None]] = None,
+    deselected: Iterable[PropertyPath] = (),
+    path: PropertyPath = (),
+) -> Conformer:
+    """Compile the schema of the object at `path` into a single-pass conformer.
+
+    The conformer drops keys that are not in `properties`, at any depth,
+    calling `on_unmapped` with their paths, and applies each property's
+    precompiled coercion, without looking at the schema again. Properties
+    at the `deselected` paths are dropped as well, without calling
+    `on_unmapped`.
+    """
+    deselected = set(deselected)
+    dropped = {path[0] for path in deselected if len(path) == 1}
+    conformers = {
+        name: compile_property(
+            schema,
+            [nested[1:] for nested in deselected if len(nested) > 1 and nested[0] == name],
+            on_unmapped,
+            path + (name,),
+        )
+        for name, schema in properties.items()
+        if name not in dropped
+    }
+
+    def conform_object(value: Any) -> Any:
+        if not isinstance(value, dict):
+            return value
+        result = {}
+        for name, item in value.items():
+            try:
+                conformer = conformers[name]
+            except KeyError:
+                if on_unmapped is not None and name not in dropped:
+                    on_unmapped(path + (name,))
+                continue
+            result[name] = item if conformer is None else conformer(item)
+        return result
+
+    return conform_object
+
+
+def deselected_paths(
+    schema: dict, mask, breadcrumb: tuple = ()
+) -> Iterator[PropertyPath]:
+    """Yield the paths of the properties deselected in a stream's selection `mask`.
+
+    Like the SDK, nested object properties are followed but array items are not.
+    """
+    for name, property_schema in schema.get("properties", {}).items():
+        property_breadcrumb = breadcrumb + ("properties", name)
+        if not mask.get(property_breadcrumb, True):
+            yield property_breadcrumb[1::2]
+        elif "object" in _types(property_schema):
+            yield from deselected_paths(property_schema, mask, property_breadcrumb)
+
+
+def compile_record_conformer(
+    schema: dict,
+    stream_name: str,
+    logger,
+    deselected: Iterable[PropertyPath] = (),
+) -> Conformer:
+    """Return the record conformer for a stream's schema.
+
+    Properties missing from the schema, nested ones included, are removed,
+    with a warning logged the first time each path is seen. Properties at
+    the `deselected` paths are removed without a warning.
+    """
+    warned = set()
+
+    def on_unmapped(path: PropertyPath) -> None:
+        if path not in warned:
+            warned.add(path)
+            logger.warning(
+                f"Property '{'.'.join(path)}' was present in the '{stream_name}' "
+                "stream but not found in catalog schema. Ignoring."
+            )
+
+    return compile_object(schema.get("properties", {}), on_unmapped, deselected)
@@ -0,0 +1,29 @@
+"""Duplicate suppression for records fetched from overlapping windows."""
+from collections import OrderedDict
+from typing import Hashable
+
+DEFAULT_DEDUP_CACHE_SIZE = 100_000
+
+
+class RecentKeys:
+    """Remembers the last `max_size` keys seen, dropping the least recent.
+
+    Overlapping windows return the same record close together, so a
+    bounded LRU catches those duplicates exactly with fixed memory.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_DEDUP_CACHE_SIZE) -> None:
+        self.max_size = max_size
+        self.duplicates = 0
+        self._keys = OrderedDict()
+
+    def seen(self, key: Hashable) -> bool:
+        """Return whether `key` was seen recently, then remember it."""
+        if key in self._keys:
+            self._keys.move_to_end(key)
+            self.duplicates += 1
+            return True
+        self._keys[key] = None
+        if len(self._keys) > self.max_size:
+            self._keys.popitem(last=False)
+        return False
@@ -0,0 +1,35 @@
+"""Writing the files the tap keeps between runs."""
+import os
+import tempfile
+from typing import AnyStr, Optional
+
+
+def atomic_write(
+    path: str,
+    data: AnyStr,
+    mode: str = "w",
+    permissions: Optional[int] = None,
+    fsync: bool = False,
+) -> None:
+    """Replace the file at `path` with `data`, so readers never see a partial file.
+
+    The data is written to a temporary file in the same directory, which
+    is created if missing, and renamed over `path`. Temporary files are
+    private to the user unless `permissions` says otherwise; `fsync` makes
+    the data durable before the rename.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode) as outfile:
+            outfile.write(data)
+            if fsync:
+                outfile.flush()
+                os.fsync(outfile.fileno())
+        if permissions is not None:
+            os.chmod(tmp_path, permissions)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
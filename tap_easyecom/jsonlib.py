@@ -0,0 +1,87 @@
+"""JSON decoding helpers shared by the EasyEcom streams."""
+import json
+import re
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Iterable, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+_MISSING = object()
+_ENVELOPE_PATH = re.compile(r"^\$((?:\.[A-Za-z_][A-Za-z0-9_]*)*)\[\*\]$")
+
+
+def loads(data) -> Any:
+    """Decode JSON text or bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    return str(obj)
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode `obj` as compact JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default)
+    return json.dumps(obj, separators=(",", ":"), default=_default).encode()
+
+
+def dumps_sorted(obj: Any) -> bytes:
+    """Encode `obj` as compact JSON bytes with sorted keys."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS, default=_default)
+    return json.dumps(
+        obj, sort_keys=True, separators=(",", ":"), default=_default
+    ).encode()
+
+
+def response_json(response) -> Any:
+    """Return the decoded body of `response`, decoding it only once.
+
+    The decoded payload is cached on the response so pagination, the empty
+    data check and record extraction all share a single decode.
+    """
+    payload = getattr(response, "_easyecom_json", _MISSING)
+    if payload is _MISSING:
+        payload = loads(response.content)
+        response._easyecom_json = payload
+    return payload
+
+
+def compile_records_path(jsonpath: str) -> Optional[Tuple[str, ...]]:
+    """Turn a simple envelope path such as `$.data.orders[*]` into its keys.
+
+    Returns None for anything more involved, which should then go through a
+    full JSONPath engine.
+    """
+    match = _ENVELOPE_PATH.match(jsonpath)
+    if not match:
+        return None
+    return tuple(key for key in match.group(1).split(".") if key)
+
+
+def extract_records(payload: Any, path: Tuple[str, ...]) -> Iterable[Any]:
+    """Yield the records found at `path`, as `<path>[*]` would match them.
+
+    That is the items of a list, or a single object itself. Scalars, such
+    as the API's "No Data Found" messages, yield nothing.
+    """
+    node = payload
+    for key in path:
+        if not isinstance(node, dict) or key not in node:
+            return
+        node = node[key]
+    if isinstance(node, list):
+        yield from node
+    elif isinstance(node, dict):
+        yield node
@@ -0,0 +1,205 @@
+"""Request metrics collected across every stream of a sync."""
+import json
+import math
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+from tap_easyecom.files import atomic_write
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, math.inf)
+PAGE_SIZE_BUCKETS = (0, 1, 5, 10, 25, 50, 100, 250, math.inf)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    def __init__(self, buckets: Iterable[float]) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.sum += value
+        self.count += 1
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "buckets": {
+                ("+Inf" if bound == math.inf else str(bound)): count
+                for bound, count in self.cumulative()
+            },
+        }
+
+
+class EndpointMetrics:
+    """Everything measured for one stream and endpoint."""
+
+    def __init__(self) -> None:
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.records_per_page = Histogram(PAGE_SIZE_BUCKETS)
+        self.requests = 0
+        self.response_bytes = 0
+        self.pages = 0
+        self.records = 0
+        self.retries = 0
+        self.backoff_seconds = 0.0
+        self.throttled = 0
+        self.duplicates = 0
+        self.status_codes: Dict[int, int] = defaultdict(int)
+
+    def to_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "response_bytes": self.response_bytes,
+            "pages": self.pages,
+            "records": self.records,
+            "retries": self.retries,
+            "backoff_seconds": round(self.backoff_seconds, 3),
+            "throttled": self.throttled,
+            "duplicates": self.duplicates,
+            "status_codes": dict(self.status_codes),
+            "latency_seconds": self.latency.to_dict(),
+            "records_per_page": self.records_per_page.to_dict(),
+        }
+
+
+class SyncMetrics:
+    """Thread-safe registry of request metrics, keyed by stream and endpoint."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._endpoints: Dict[Tuple[str, str], EndpointMetrics] = defaultdict(
+            EndpointMetrics
+        )
+        self.token_refreshes = 0
+
+    def observe_request(
+        self, stream: str, endpoint: str, seconds: float, status_code: int, size: int
+    ) -> None:
+        with self._lock:
+            metrics = self._endpoints[stream, endpoint]
+            metrics.requests += 1
+            metrics.latency.observe(seconds)
+            metrics.response_bytes += size
+            metrics.status_codes[status_code] += 1
+            if status_code == 429:
+                metrics.throttled += 1
+
+    def observe_page(self, stream: str, endpoint: str, records: int) -> None:
+        with self._lock:
+            metrics = self._endpoints[stream, endpoint]
+            metrics.pages += 1
+            metrics.records += records
+            metrics.records_per_page.observe(records)
+
+    def observe_retry(self, stream: str, endpoint: str, wait: float) -> None:
+        with self._lock:
+            metrics = self._endpoints[stream, endpoint]
+            metrics.retries += 1
+            metrics.backoff_seconds += wait
+
+    def observe_duplicates(self, stream: str, endpoint: str, count: int) -> None:
+        with self._lock:
+            self._endpoints[stream, endpoint].duplicates += count
+
+    def observe_token_refresh(self) -> None:
+        with self._lock:
+            self.token_refreshes += 1
+
+    def log(self, logger) -> None:
+        """Log one structured METRIC line per stream and endpoint."""
+        with self._lock:
+            for (stream, endpoint), metrics in sorted(self._endpoints.items()):
+                point = {
+                    "type": "summary",
+                    "metric": "easyecom_requests",
+                    "tags": {"stream": stream, "endpoint": endpoint},
+                    "value": metrics.to_dict(),
+                }
+                logger.info(f"METRIC: {json.dumps(point)}")
+            point = {
+                "type": "counter",
+                "metric": "easyecom_token_refreshes",
+                "value": self.token_refreshes,
+            }
+            logger.info(f"METRIC: {json.dumps(point)}")
+
+    def to_prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        lines = []
+
+        def family(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def labels(stream: str, endpoint: str, **extra: str) -> str:
+            pairs = {"stream": stream, "endpoint": endpoint, **extra}
+            return ",".join(f'{key}="{_escape(value)}"' for key, value in pairs.items())
+
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+            for name, help_text, histogram_of in (
+                (
+                    "easyecom_request_duration_seconds",
+                    "Latency of EasyEcom API requests.",
+                    lambda metrics: metrics.latency,
+                ),
+                (
+                    "easyecom_records_per_page",
+                    "Records returned per page.",
+                    lambda metrics: metrics.records_per_page,
+                ),
+            ):
+                family(name, "histogram", help_text)
+                for (stream, endpoint), metrics in endpoints:
+                    histogram = histogram_of(metrics)
+                    for bound, count in histogram.cumulative():
+                        le = "+Inf" if bound == math.inf else repr(float(bound))
+                        lines.append(
+                            f"{name}_bucket{{{labels(stream, endpoint, le=le)}}} {count}"
+                        )
+                    lines.append(f"{name}_sum{{{labels(stream, endpoint)}}} {histogram.sum}")
+                    lines.append(f"{name}_count{{{labels(stream, endpoint)}}} {histogram.count}")
+
+            for name, attribute, help_text in (
+                ("easyecom_requests_total", "requests", "Requests sent."),
+                ("easyecom_response_bytes_total", "response_bytes", "Response body bytes received."),
+                ("easyecom_pages_total", "pages", "Pages of records received."),
+                ("easyecom_records_total", "records", "Records received."),
+                ("easyecom_retries_total", "retries", "Requests retried after an error."),
+                ("easyecom_backoff_seconds_total", "backoff_seconds", "Time spent in retry backoff."),
+                ("easyecom_throttled_total", "throttled", "Requests answered with 429."),
+                ("easyecom_duplicates_total", "duplicates", "Duplicate records dropped."),
+            ):
+                family(name, "counter", help_text)
+                for (stream, endpoint), metrics in endpoints:
+                    value = getattr(metrics, attribute)
+                    lines.append(f"{name}{{{labels(stream, endpoint)}}} {value}")
+
+            family("easyecom_token_refreshes_total", "counter", "Access token logins.")
+            lines.append(f"easyecom_token_refreshes_total {self.token_refreshes}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """Atomically write a textfile for the node exporter's textfile collector."""
+        atomic_write(path, self.to_prometheus(), permissions=0o644)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,195 @@
+"""Singer message output shared by every stream of the tap."""
+import gzip
+import os
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import singer
+
+from tap_easyecom.jsonlib import dumps
+
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+DEFAULT_BATCH_FILE_SIZE = 64 * 1024 * 1024
+
+
+class BatchMessage:
+    """A Singer SDK BATCH message pointing to gzipped JSONL record files."""
+
+    def __init__(self, stream: str, manifest: List[str]) -> None:
+        self.stream = stream
+        self.manifest = manifest
+
+    def asdict(self) -> dict:
+        return {
+            "type": "BATCH",
+            "stream": self.stream,
+            "encoding": {"format": "jsonl", "compression": "gzip"},
+            "manifest": self.manifest,
+        }
+
+
+class BatchFile:
+    """A gzip-compressed JSONL file being filled with one stream's records."""
+
+    def __init__(self, batch_dir: str, stream: str) -> None:
+        self.path = Path(batch_dir, f"{stream}-{uuid.uuid4()}.json.gz").absolute()
+        self.size = 0
+        self._file = gzip.open(self.path, "wb")
+
+    def write(self, record: dict) -> None:
+        line = dumps(record) + b"\n"
+        self._file.write(line)
+        self.size += len(line)
+
+    def close(self) -> str:
+        self._file.close()
+        return self.path.as_uri()
+
+
+class MessageWriter:
+    """Serializes Singer messages from concurrently syncing streams.
+
+    Streams hold `lock` while they write a message or update the tap state,
+    so RECORD, SCHEMA and STATE lines never interleave on stdout and a STATE
+    message is never serialized while another stream is changing it.
+
+    With `buffered`, messages are encoded with the fast JSON encoder and
+    collected into writes of about `buffer_size` bytes. The buffer is always
+    flushed right after a STATE message, so a target never sees a state
+    ahead of the records it covers.
+
+    With `batch_dir`, records are written to gzipped JSONL files of about
+    `batch_file_size` uncompressed bytes instead, and a BATCH message is
+    emitted for each file once it is full or its stream finished. For the
+    same reason the buffer is flushed, STATE messages are held back while
+    any file is open and written once the last one is closed.
+
+    With `state_interval_records` or `state_interval_seconds`, STATE messages
+    passed to `write_state` are coalesced: one is only written once that
+    many records were written or seconds passed since the last one. The
+    latest skipped state is kept and written by `flush_state` or `close`.
+    """
+
+    def __init__(
+        self,
+        buffered: bool = False,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        batch_dir: Optional[str] = None,
+        batch_file_size: int = DEFAULT_BATCH_FILE_SIZE,
+        state_interval_records: int = 0,
+        state_interval_seconds: float = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.lock = threading.RLock()
+        self.buffered = buffered
+        self.buffer_size = buffer_size
+        self._buffer = bytearray()
+        self.batch_dir = batch_dir
+        self.batch_file_size = batch_file_size
+        self._batch_files: Dict[str, BatchFile] = {}
+        if batch_dir:
+            os.makedirs(batch_dir, exist_ok=True)
+        self.state_interval_records = state_interval_records
+        self.state_interval_seconds = state_interval_seconds
+        self._clock = clock
+        self._records_since_state = 0
+        self._state_written_at = clock()
+        self._pending_state: Optional[dict] = None
+
+    def write_batch_record(self, stream: str, record: dict) -> None:
+        """Add a record to the current batch file of `stream`."""
+        with self.lock:
+            batch_file = self._batch_files.get(stream)
+            if batch_file is None:
+                batch_file = self._batch_files[stream] = BatchFile(self.batch_dir, stream)
+            batch_file.write(record)
+            self._records_since_state += 1
+            if batch_file.size >= self.batch_file_size:
+                self._close_batch_file(stream)
+
+    def _close_batch_file(self, stream: str) -> None:
+        uri = self._batch_files.pop(stream).close()
+        self.write_message(BatchMessage(stream, [uri]))
+        if not self._batch_files:
+            self.flush_state()
+
+    def close_batch_file(self, stream: str) -> None:
+        """Close the open batch file of `stream`, if any, and emit its BATCH message."""
+        with self.lock:
+            if stream in self._batch_files:
+                self._close_batch_file(stream)
+
+    def close_batch_files(self) -> None:
+        """Close every open batch file and emit its BATCH message."""
+        with self.lock:
+            for stream in list(self._batch_files):
+                self._close_batch_file(stream)
+
+    def _state_due(self) -> bool:
+        if self.state_interval_records <= 0 and self.state_interval_seconds <= 0:
+            return True
+        return (
+            0 < self.state_interval_records <= self._records_since_state
+            or 0 < self.state_interval_seconds
+            <= self._clock() - self._state_written_at
+        )
+
+    def write_state(self, state: dict, force: bool = False) -> None:
+        """Write a STATE message for `state`, unless it is coalesced.
+
+        `state` is only serialized when written, so a coalesced state is
+        written as it stands by then. While batch files are open, even a
+        forced state waits for them to be closed.
+        """
+        with self.lock:
+            if self._batch_files or (not force and not self._state_due()):
+                self._pending_state = state
+                return
+            self._pending_state = None
+            self.write_message(singer.StateMessage(value=state))
+
+    def flush_state(self) -> None:
+        """Write the latest coalesced state, if any and no batch file is open."""
+        with self.lock:
+            if self._pending_state is not None and not self._batch_files:
+                self.write_state(self._pending_state, force=True)
+
+    def write_message(self, message) -> None:
+        with self.lock:
+            if isinstance(message, singer.StateMessage):
+                self._records_since_state = 0
+                self._state_written_at = self._clock()
+            elif isinstance(message, singer.RecordMessage):
+                self._records_since_state += 1
+            if not self.buffered:
+                singer.write_message(message)
+                return
+            self._buffer += dumps(message.asdict())
+            self._buffer += b"\n"
+            if (
+                isinstance(message, singer.StateMessage)
+                or len(self._buffer) >= self.buffer_size
+            ):
+                self.flush()
+
+    def close(self) -> None:
+        """Close batch files, then write any coalesced state and buffered messages."""
+        with self.lock:
+            self.close_batch_files()
+            self.flush_state()
+            self.flush()
+
+    def flush(self) -> None:
+        """Write out any buffered messages."""
+        with self.lock:
+            if not self._buffer:
+                return
+            # Anything written through the text layer must come out first.
+            sys.stdout.flush()
+            sys.stdout.buffer.write(self._buffer)
+            sys.stdout.buffer.flush()
+            self._buffer.clear()
@@ -0,0 +1,77 @@
+"""Detection of the largest page size each endpoint accepts."""
+import json
+import os
+import threading
+import time
+from typing import Callable, Optional, Tuple
+
+from tap_easyecom.files import atomic_write
+
+DEFAULT_MAX_PAGE_SIZE = 1000
+DEFAULT_PAGE_SIZE_TTL = 7 * 24 * 60 * 60
+
+# Returns the number of records and whether there are more pages, or None
+# when the endpoint rejected the limit.
+Probe = Callable[[int], Optional[Tuple[int, bool]]]
+
+
+def detect_page_size(probe: Probe, largest: int, smallest: int) -> Optional[int]:
+    """Return the largest limit the endpoint honours, or None if unknown.
+
+    Starts at `largest` and halves the limit while the endpoint rejects it.
+    An endpoint that silently caps the limit gives itself away by returning
+    fewer records than asked for while announcing a next page. Fewer records
+    without a next page leave the limit unknown.
+    """
+    limit = largest
+    while limit >= smallest:
+        result = probe(limit)
+        if result is None:
+            limit //= 2
+            continue
+        records, has_more = result
+        if not records:
+            # Nothing to learn from an empty response.
+            return None
+        if records < limit:
+            return records if has_more else None
+        return limit
+    return None
+
+
+class PageSizeStore:
+    """Detected page sizes per endpoint, kept on disk for `ttl` seconds."""
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = DEFAULT_PAGE_SIZE_TTL,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = path
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = {}
+        if os.path.exists(path):
+            with open(path) as infile:
+                self._entries = json.load(infile)
+
+    def get(self, endpoint: str) -> Optional[int]:
+        """Return the page size detected for `endpoint`, unless it is too old."""
+        with self._lock:
+            entry = self._entries.get(endpoint)
+        if entry is None or entry["detected_at"] + self.ttl <= self._clock():
+            return None
+        return entry["page_size"]
+
+    def set(self, endpoint: str, page_size: int) -> None:
+        """Remember `page_size` for `endpoint` and write the store."""
+        with self._lock:
+            self._entries[endpoint] = {
+                "page_size": page_size,
+                "detected_at": self._clock(),
+            }
+            atomic_write(
+                self.path, json.dumps(self._entries, indent=4, sort_keys=True)
+            )
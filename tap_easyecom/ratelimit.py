@@ -0,0 +1,150 @@
+"""Adaptive rate limiting shared by every EasyEcom request."""
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Callable, Mapping, Optional
+
+# Stay this far under the rate the API is observed to allow.
+HEADROOM = 0.9
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Return the number of seconds a `Retry-After` header asks us to wait."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at - (time.time() if now is None else now), 0.0)
+
+
+def _header(headers: Mapping[str, str], *names: str) -> Optional[float]:
+    for name in names:
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            return float(value)
+        except ValueError:
+            continue
+    return None
+
+
+class AdaptiveRateLimiter:
+    """Token bucket that learns how fast the API lets us go.
+
+    The bucket starts at `rate` requests per second (unlimited when None).
+    A 429 halves the rate, measured against the throughput actually achieved,
+    and pauses every caller for `Retry-After`. Rate-limit headers, when the
+    API sends them, cap the rate so the remaining quota lasts until the
+    window resets. Successful responses slowly raise the rate again, up to
+    `max_rate`, or without one, up to the rate that drew the first 429.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        max_rate: Optional[float] = None,
+        min_rate: float = 0.1,
+        increase: float = 0.05,
+        default_retry_after: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.rate = rate
+        self.max_rate = max_rate or rate
+        self.min_rate = min_rate
+        self.increase = increase
+        self.default_retry_after = default_retry_after
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = 1.0
+        self._updated_at = clock()
+        self._blocked_until = 0.0
+        self._ceiling: Optional[float] = None
+        self._sent = deque(maxlen=200)
+        self.throttled = 0
+
+    def acquire(self) -> float:
+        """Wait for a slot to send one request; return the time waited."""
+        wait = self.reserve()
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    def reserve(self) -> float:
+        """Take a slot to send one request; return how long to wait before sending."""
+        with self._lock:
+            now = self._clock()
+            wait = max(self._blocked_until - now, 0.0)
+            if self.rate:
+                self._tokens = min(
+                    self._tokens + (now - self._updated_at) * self.rate, 1.0
+                )
+                self._tokens -= 1
+                if self._tokens < 0:
+                    wait = max(wait, -self._tokens / self.rate)
+            self._updated_at = now
+            self._sent.append(now + wait)
+        return wait
+
+    def observe(self, response) -> None:
+        """Adjust the pace from a response's status code and headers."""
+        headers = response.headers
+        with self._lock:
+            now = self._clock()
+            if response.status_code == 429:
+                self.throttled += 1
+                retry_after = parse_retry_after(headers.get("Retry-After"))
+                if retry_after is None:
+                    retry_after = self.default_retry_after
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+                known_rates = [
+                    rate for rate in (self.rate, self._achieved_rate(now)) if rate
+                ]
+                base = min(known_rates) if known_rates else self.min_rate
+                if self.max_rate is None and known_rates:
+                    # Never recover past the pace that got us throttled.
+                    self.max_rate = base
+                self.rate = max(base * HEADROOM / 2, self.min_rate)
+                self._tokens = min(self._tokens, 0.0)
+            elif self.rate and response.status_code < 400:
+                self.rate += self.increase
+                for limit in (self.max_rate, self._ceiling):
+                    if limit:
+                        self.rate = min(self.rate, limit)
+
+            self._apply_quota_headers(headers, now)
+
+    def _apply_quota_headers(self, headers: Mapping[str, str], now: float) -> None:
+        remaining = _header(headers, "X-RateLimit-Remaining", "RateLimit-Remaining")
+        reset = _header(headers, "X-RateLimit-Reset", "RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+        # Some APIs send the reset as an epoch timestamp, others as seconds.
+        if reset > 1e9:
+            reset = reset - time.time()
+        if reset <= 0:
+            return
+        if remaining <= 0:
+            self._blocked_until = max(self._blocked_until, now + reset)
+            return
+        self._ceiling = remaining / reset * HEADROOM
+        if self.rate is None or self.rate > self._ceiling:
+            self.rate = max(self._ceiling, self.min_rate)
+
+    def _achieved_rate(self, now: float) -> Optional[float]:
+        """Return the request rate over the recent past, if measurable."""
+        if len(self._sent) < 2:
+            return None
+        elapsed = now - self._sent[0]
+        if elapsed <= 0:
+            return None
+        return len(self._sent) / elapsed
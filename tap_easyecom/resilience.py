@@ -0,0 +1,88 @@
+"""Time budgets and circuit breaking for requests to the EasyEcom API."""
+import math
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+class DeadlineExceeded(Exception):
+    """The time budget of the sync or stream ran out."""
+
+
+class CircuitOpenError(Exception):
+    """Requests to an endpoint are refused after repeated failures."""
+
+
+class Deadline:
+    """A time budget that starts running when it is created.
+
+    A budget of None never runs out.
+    """
+
+    def __init__(
+        self,
+        seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.seconds = seconds
+        self._clock = clock
+        self._started = clock()
+
+    def remaining(self) -> float:
+        if self.seconds is None:
+            return math.inf
+        return max(self.seconds - (self._clock() - self._started), 0.0)
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def expire(self) -> None:
+        """Spend the rest of the budget at once."""
+        self.seconds = 0
+        self._started = self._clock()
+
+
+class CircuitBreaker:
+    """Counts consecutive failures per endpoint and opens after `threshold`.
+
+    An open circuit refuses requests for `reset_timeout` seconds, then lets
+    them through again: one success closes it, one failure reopens it.
+    """
+
+    def __init__(
+        self,
+        threshold: int = 5,
+        reset_timeout: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures: Dict[str, int] = {}
+        self._opened_at: Dict[str, float] = {}
+
+    def check(self, endpoint: str) -> None:
+        """Raise CircuitOpenError if requests to `endpoint` are refused."""
+        with self._lock:
+            opened_at = self._opened_at.get(endpoint)
+            if opened_at is None:
+                return
+            retry_in = opened_at + self.reset_timeout - self._clock()
+        if retry_in > 0:
+            raise CircuitOpenError(
+                f"{endpoint} failed {self._failures[endpoint]} times in a row, "
+                f"not retrying for {retry_in:.0f}s."
+            )
+
+    def record_success(self, endpoint: str) -> None:
+        with self._lock:
+            self._failures.pop(endpoint, None)
+            self._opened_at.pop(endpoint, None)
+
+    def record_failure(self, endpoint: str) -> None:
+        with self._lock:
+            failures = self._failures.get(endpoint, 0) + 1
+            self._failures[endpoint] = failures
+            if failures >= self.threshold:
+                self._opened_at[endpoint] = self._clock()
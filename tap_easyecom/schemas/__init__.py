@@ -1 +1,27 @@
 """JSON schema files for the REST API."""
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+SCHEMAS_DIR = Path(__file__).parent
+
+
+@lru_cache(maxsize=None)
+def load_schema(name: str) -> dict:
+    """Return the schema in `<name>.json`, reading the file only once."""
+    with open(SCHEMAS_DIR / f"{name}.json") as infile:
+        return json.load(infile)
+
+
+class StreamSchema:
+    """Stream `schema` attribute that loads the stream's schema file when first used.
+
+    The file is named after the stream unless `name` is given.
+    """
+
+    def __init__(self, name: Optional[str] = None) -> None:
+        self.name = name
+
+    def __get__(self, instance, owner) -> dict:
+        return load_schema(self.name or owner.name)
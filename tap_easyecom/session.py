@@ -0,0 +1,19 @@
+"""HTTP session shared by all EasyEcom traffic."""
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_POOL_SIZE = 10
+
+
+def build_session(pool_size: int = DEFAULT_POOL_SIZE) -> requests.Session:
+    """Return a keep-alive session with a connection pool of `pool_size`.
+
+    Every stream, worker and token call reuses the pooled connections, so
+    only the first request to the API pays for the TCP and TLS handshakes.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Accept-Encoding"] = "gzip, deflate"
+    return session
@@ -1,8 +1,31 @@
 """EasyEcom tap class."""
 
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from importlib import metadata
+from typing import Optional, Set
+
 from singer_sdk import Tap
+from singer_sdk.helpers._singer import Catalog
 from singer_sdk import typing as th  # JSON schema typing helpers
 
+from tap_easyecom.auth import DEFAULT_REFRESH_MARGIN, TokenManager
+from tap_easyecom.cache import DEFAULT_CACHE_MAX_SIZE, ResponseCache
+from tap_easyecom.files import atomic_write
+from tap_easyecom.metrics import SyncMetrics
+from tap_easyecom.output import (
+    DEFAULT_BATCH_FILE_SIZE,
+    DEFAULT_BUFFER_SIZE,
+    MessageWriter,
+)
+from tap_easyecom.pagesize import DEFAULT_PAGE_SIZE_TTL, PageSizeStore
+from tap_easyecom.ratelimit import AdaptiveRateLimiter
+from tap_easyecom.resilience import CircuitBreaker, Deadline
+from tap_easyecom.session import DEFAULT_POOL_SIZE, build_session
+from tap_easyecom.transport import DEFAULT_MAX_CONCURRENCY, AsyncTransport
 from tap_easyecom.streams import (
     ProductsStream,
     ProductCompositionsStream,
@@ -39,14 +62,257 @@ class TapEasyEcom(Tap):
     ) -> None:
         super().__init__(config, catalog, state, parse_env_config, validate_config)
         self.config_file = config[0]
+        self.requests_session = build_session(
+            self.config.get("http_pool_size", DEFAULT_POOL_SIZE)
+        )
+        self.transport = None
+        if self.config.get("async_transport"):
+            self.transport = AsyncTransport(
+                max_concurrency=self.config.get(
+                    "async_max_concurrency", DEFAULT_MAX_CONCURRENCY
+                ),
+                http2=self.config.get("http2", True),
+                pool_size=self.config.get("http_pool_size", DEFAULT_POOL_SIZE),
+            )
+        self.rate_limiter = AdaptiveRateLimiter(
+            rate=self.config.get("max_requests_per_second")
+        )
+        self.message_writer = MessageWriter(
+            buffered=self.config.get("fast_output", False),
+            buffer_size=self.config.get("output_buffer_size", DEFAULT_BUFFER_SIZE),
+            batch_dir=(
+                self.config.get("batch_dir", ".easyecom/batches")
+                if self.config.get("batch_output")
+                else None
+            ),
+            batch_file_size=self.config.get("batch_file_size", DEFAULT_BATCH_FILE_SIZE),
+            state_interval_records=self.config.get("state_interval_records", 0),
+            state_interval_seconds=self.config.get("state_interval_seconds", 0),
+        )
+        self.metrics = SyncMetrics()
+        self.sync_deadline = Deadline(self.config.get("sync_time_budget"))
+        self.circuit_breaker = CircuitBreaker(
+            threshold=self.config.get("circuit_breaker_threshold", 5),
+            reset_timeout=self.config.get("circuit_breaker_reset", 60),
+        )
+        self.response_cache = None
+        if self.config.get("response_cache_dir"):
+            self.response_cache = ResponseCache(
+                self.config["response_cache_dir"],
+                namespace="|".join(
+                    str(self.config.get(key))
+                    for key in ("api_url", "email", "location_key")
+                ),
+                max_size=self.config.get(
+                    "response_cache_max_size", DEFAULT_CACHE_MAX_SIZE
+                ),
+            )
+        self.page_size_store = None
+        if self.config.get("detect_page_size"):
+            self.page_size_store = PageSizeStore(
+                self.config.get("page_size_cache", ".easyecom/page_sizes.json"),
+                self.config.get("page_size_ttl", DEFAULT_PAGE_SIZE_TTL),
+            )
+        self._token_managers = {}
+        self._token_manager_lock = threading.Lock()
 
     # TODO: Update this section with the actual config values you expect:
     config_jsonschema = th.PropertiesList(
         th.Property("start_date", th.DateTimeType,),
+        th.Property("api_url", th.StringType),
+        th.Property("location_keys", th.ArrayType(th.StringType)),
+        th.Property("window_workers", th.IntegerType),
+        th.Property("window_min_days", th.NumberType),
+        th.Property("window_max_days", th.NumberType),
+        th.Property("window_max_pages", th.IntegerType),
+        th.Property("http_pool_size", th.IntegerType),
+        th.Property("async_transport", th.BooleanType),
+        th.Property("async_max_concurrency", th.IntegerType),
+        th.Property("http2", th.BooleanType),
+        th.Property("token_refresh_margin", th.IntegerType),
+        th.Property("request_timeout", th.IntegerType),
+        th.Property("sync_time_budget", th.NumberType),
+        th.Property("stream_time_budget", th.NumberType),
+        th.Property("circuit_breaker_threshold", th.IntegerType),
+        th.Property("circuit_breaker_reset", th.NumberType),
+        th.Property("max_requests_per_second", th.NumberType),
+        th.Property("stream_workers", th.IntegerType),
+        th.Property("prefetch_pages", th.IntegerType),
+        th.Property("detect_page_size", th.BooleanType),
+        th.Property("max_page_size", th.IntegerType),
+        th.Property("page_size_cache", th.StringType),
+        th.Property("page_size_ttl", th.IntegerType),
+        th.Property("checkpoint_interval", th.IntegerType),
+        th.Property("skip_unchanged_records", th.BooleanType),
+        th.Property("change_store_dir", th.StringType),
+        th.Property("emit_tombstones", th.BooleanType),
+        th.Property("dedup_cache_size", th.IntegerType),
+        th.Property("fast_output", th.BooleanType),
+        th.Property("output_buffer_size", th.IntegerType),
+        th.Property("batch_output", th.BooleanType),
+        th.Property("batch_dir", th.StringType),
+        th.Property("batch_file_size", th.IntegerType),
+        th.Property("state_interval_records", th.IntegerType),
+        th.Property("state_interval_seconds", th.NumberType),
+        th.Property("prometheus_textfile", th.StringType),
+        th.Property("catalog_cache_dir", th.StringType),
+        th.Property("response_cache_dir", th.StringType),
+        th.Property("response_cache_ttl", th.IntegerType),
+        th.Property("response_cache_max_size", th.IntegerType),
     ).to_dict()
 
+    def get_token_manager(
+        self, auth_endpoint: str, location_key: Optional[str] = None
+    ) -> TokenManager:
+        """Return the token manager shared by all streams syncing a location."""
+        with self._token_manager_lock:
+            if location_key not in self._token_managers:
+                self._token_managers[location_key] = TokenManager(
+                    self,
+                    auth_endpoint,
+                    self.config.get("token_refresh_margin", DEFAULT_REFRESH_MARGIN),
+                    location_key,
+                )
+            return self._token_managers[location_key]
+
     def discover_streams(self):
-        return [stream(self) for stream in STREAM_TYPES]
+        selected = self._selected_stream_names()
+        return [
+            stream(self)
+            for stream in STREAM_TYPES
+            if selected is None or stream.name in selected
+        ]
+
+    def _selected_stream_names(self) -> Optional[Set[str]]:
+        """Return the streams selected in the input catalog, or None without one.
+
+        Streams the catalog does not select are never constructed, so a run
+        of one stream does not pay for loading the others.
+        """
+        if not self.input_catalog:
+            return None
+        selected = set()
+        for entry in self.input_catalog.to_dict()["streams"]:
+            for stream_metadata in entry.get("metadata", []):
+                if stream_metadata.get("breadcrumb"):
+                    continue
+                root = stream_metadata.get("metadata", {})
+                if root.get("selected", root.get("selected-by-default", False)):
+                    selected.add(entry["tap_stream_id"])
+        return selected
+
+    @property
+    def _singer_catalog(self) -> Catalog:
+        """Return the discovered catalog, from `catalog_cache_dir` when cached."""
+        cache_path = self._catalog_cache_path()
+        if cache_path and os.path.exists(cache_path):
+            with open(cache_path) as infile:
+                return Catalog.from_dict(json.load(infile))
+        catalog = super()._singer_catalog
+        if cache_path:
+            atomic_write(cache_path, json.dumps(catalog.to_dict()))
+        return catalog
+
+    def _catalog_cache_path(self) -> Optional[str]:
+        """Return where to cache the catalog of this package version and config."""
+        cache_dir = self.config.get("catalog_cache_dir")
+        if not cache_dir:
+            return None
+        try:
+            version = metadata.version("tap-easyecom")
+        except metadata.PackageNotFoundError:
+            return None
+        # These settings add properties or key properties to the schemas.
+        schema_config = json.dumps(
+            {
+                key: self.config.get(key)
+                for key in ("location_keys", "skip_unchanged_records", "emit_tombstones")
+            },
+            sort_keys=True,
+        )
+        digest = hashlib.sha256(schema_config.encode()).hexdigest()[:16]
+        return os.path.join(cache_dir, f"catalog-{version}-{digest}.json")
+
+    def sync_all(self) -> None:
+        """Sync all selected streams, `stream_workers` of them at a time.
+
+        `Tap.sync_all` is final for type checkers only. With more than one
+        worker, every selected stream, and every location of a partitioned
+        stream, is synced on its own thread, and the first failure stops
+        the sync. Output is flushed and metrics are reported either way.
+        """
+        try:
+            if self.config.get("stream_workers", 1) > 1:
+                self._sync_all_in_parallel()
+            else:
+                super().sync_all()
+        finally:
+            self._finish_sync()
+
+    def _sync_all_in_parallel(self) -> None:
+        self._reset_state_progress_markers()
+        self._set_compatible_replication_methods()
+        jobs = []
+        for stream in self.streams.values():
+            if not stream.selected and not stream.has_selected_descendents:
+                self.logger.info(f"Skipping deselected stream '{stream.name}'.")
+                continue
+            if stream.parent_stream_type:
+                continue
+            # Create every bookmark entry up front so worker threads only
+            # ever update their own stream's or partition's state.
+            stream.stream_state
+            if not stream.partitions:
+                jobs.append((stream, None))
+                continue
+            # Each location is synced by its own copy of the stream, so the
+            # copies never share window or cursor positions.
+            for context in stream.partitions:
+                stream.get_context_state(context)
+                jobs.append((stream.for_partition(), context))
+
+        stream_workers = self.config["stream_workers"]
+        self.logger.info(
+            f"Syncing {len(jobs)} streams and partitions with {stream_workers} workers."
+        )
+        executor = ThreadPoolExecutor(max_workers=stream_workers)
+        futures = [
+            executor.submit(self._sync_stream, stream, context)
+            for stream, context in jobs
+        ]
+        try:
+            for future in as_completed(futures):
+                future.result()
+        except BaseException:
+            # Streams still running end at their next request.
+            self.sync_deadline.expire()
+            raise
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+        for stream in self.streams.values():
+            stream.log_sync_costs()
+
+    def _sync_stream(self, stream, context=None) -> None:
+        stream.sync(context)
+        with self.message_writer.lock:
+            stream.finalize_state_progress_markers(stream.get_context_state(context))
+            # Coalesced with the other streams' states; `close` writes the last one.
+            stream._write_state_message()
+
+    def _finish_sync(self) -> None:
+        """Flush any buffered output, close the transport and report metrics."""
+        self.message_writer.close()
+        if self.transport:
+            self.transport.close()
+        self.metrics.log(self.logger)
+        if self.response_cache:
+            self.logger.info(
+                f"Response cache: {self.response_cache.hits} hits, "
+                f"{self.response_cache.misses} misses."
+            )
+        if self.config.get("prometheus_textfile"):
+            self.metrics.write_prometheus(self.config["prometheus_textfile"])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,164 @@
+"""Optional asyncio HTTP transport with HTTP/2 multiplexing."""
+import asyncio
+import threading
+from collections import deque
+from typing import Awaitable, Callable, Iterable, Iterator, Optional, Tuple, TypeVar
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - httpx is optional
+    httpx = None
+
+DEFAULT_MAX_CONCURRENCY = 32
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def _to_requests_response(
+    response, prepared_request: requests.PreparedRequest
+) -> requests.Response:
+    """Wrap an httpx response so the rest of the tap can treat it as usual."""
+    result = requests.Response()
+    result.status_code = response.status_code
+    result.reason = response.reason_phrase
+    result.headers = CaseInsensitiveDict(response.headers.items())
+    result.url = str(response.url)
+    result.request = prepared_request
+    result.elapsed = response.elapsed
+    result.encoding = get_encoding_from_headers(result.headers)
+    result._content = response.content
+    return result
+
+
+class AsyncTransport:
+    """Sends requests from an asyncio event loop running on its own thread.
+
+    One `httpx.AsyncClient` is shared by all streams, so requests are
+    multiplexed over a few HTTP/2 connections and at most `max_concurrency`
+    of them are in flight. Callers on other threads use the blocking `send`
+    and `request`; `map_in_order` runs coroutines on the loop instead of a
+    thread per task. Responses are returned as `requests.Response` objects
+    and transport errors are raised as their `requests` equivalents, so
+    retries, validation and parsing work as with the pooled session.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        http2: bool = True,
+        pool_size: int = 10,
+    ) -> None:
+        if httpx is None:
+            raise ImportError(
+                "The async transport needs httpx, "
+                "install tap-easyecom with the 'http2' extra."
+            )
+        self.max_concurrency = max_concurrency
+        self.http2 = http2
+        self.pool_size = pool_size
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="easyecom-transport", daemon=True
+        )
+        self._thread.start()
+        self._client = self.run(self._open())
+
+    async def _open(self):
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return httpx.AsyncClient(
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=self.pool_size,
+                max_keepalive_connections=self.pool_size,
+            ),
+            headers={"Accept-Encoding": "gzip, deflate"},
+        )
+
+    def run(self, coroutine: Awaitable[T]) -> T:
+        """Run `coroutine` on the transport's loop and wait for its result.
+
+        Raises:
+            RuntimeError: When called from the loop itself, which would never
+                get to run `coroutine`.
+        """
+        if threading.current_thread() is self._thread:
+            coroutine.close()
+            raise RuntimeError("Blocking transport call made from its event loop.")
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    async def send_async(
+        self, prepared_request: requests.PreparedRequest, timeout: Optional[float] = None
+    ) -> requests.Response:
+        body = prepared_request.body
+        if isinstance(body, str):
+            body = body.encode()
+        async with self._semaphore:
+            try:
+                response = await self._client.request(
+                    prepared_request.method,
+                    prepared_request.url,
+                    headers=dict(prepared_request.headers),
+                    content=body,
+                    timeout=timeout,
+                )
+            except httpx.TimeoutException as ex:
+                raise requests.exceptions.ReadTimeout(str(ex)) from ex
+            except httpx.TransportError as ex:
+                raise requests.exceptions.ConnectionError(str(ex)) from ex
+        return _to_requests_response(response, prepared_request)
+
+    def send(
+        self, prepared_request: requests.PreparedRequest, timeout: Optional[float] = None
+    ) -> requests.Response:
+        """Send a prepared request and wait for the response."""
+        return self.run(self.send_async(prepared_request, timeout))
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request built like `requests.request` and wait for the response."""
+        timeout = kwargs.pop("timeout", None)
+        return self.send(requests.Request(method, url, **kwargs).prepare(), timeout)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def map_in_order(
+        self,
+        func: Callable[[T], Awaitable[R]],
+        items: Iterable[T],
+        max_workers: int,
+    ) -> Iterator[Tuple[T, R]]:
+        """Yield `(item, await func(item))` in input order, like `windows.map_in_order`.
+
+        Up to `max_workers` coroutines run on the loop at a time.
+        """
+        items = iter(items)
+        pending = deque()
+        try:
+            while True:
+                for item in items:
+                    pending.append(
+                        (item, asyncio.run_coroutine_threadsafe(func(item), self._loop))
+                    )
+                    if len(pending) >= max_workers:
+                        break
+                if not pending:
+                    return
+                item, future = pending.popleft()
+                yield item, future.result()
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+    def close(self) -> None:
+        """Close the connections and stop the loop."""
+        if not self._loop.is_running():
+            return
+        self.run(self._client.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
@@ -0,0 +1,104 @@
+"""Date window helpers for windowed EasyEcom streams."""
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class DateWindow(NamedTuple):
+    """An `updated_after`/`updated_before` pair."""
+
+    start: datetime
+    end: datetime
+
+
+class WindowCursor(NamedTuple):
+    """Page token for a single page inside a date window."""
+
+    window: DateWindow
+    cursor: Optional[str] = None
+
+
+def split_windows(
+    start: datetime,
+    stop: datetime,
+    step: timedelta,
+    overlap: timedelta = timedelta(seconds=1),
+) -> List[DateWindow]:
+    """Split `[start, stop]` into consecutive windows of `step`.
+
+    Each window after the first starts `overlap` before the previous one ended,
+    the same way the sequential window walk moves forward.
+    """
+    end = start + step
+    windows = [DateWindow(start, end)]
+    while end < stop:
+        start = end - overlap
+        end = end + step
+        windows.append(DateWindow(start, end))
+    return windows
+
+
+def map_in_order(
+    func: Callable[[T], R], items: Iterable[T], max_workers: int
+) -> Iterator[Tuple[T, R]]:
+    """Yield `(item, func(item))` in input order, with up to `max_workers` calls running.
+
+    Only `max_workers` results are held at a time, so a slow item holds back
+    the ones after it instead of letting them pile up in memory.
+    """
+    items = iter(items)
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            for item in items:
+                pending.append((item, executor.submit(func, item)))
+                if len(pending) >= max_workers:
+                    break
+            while pending:
+                item, future = pending.popleft()
+                result = future.result()
+                for next_item in items:
+                    pending.append((next_item, executor.submit(func, next_item)))
+                    break
+                yield item, result
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+
+class WindowSizer:
+    """Adapts the size of the next date window to the volume of the last one.
+
+    A window that fits in a single, partly filled page doubles the next
+    window; a window that needed more than `max_pages` pages halves it.
+    The size always stays within `[min_size, max_size]`.
+    """
+
+    def __init__(
+        self,
+        size: timedelta,
+        min_size: timedelta,
+        max_size: timedelta,
+        max_pages: int,
+        page_size: int,
+    ) -> None:
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_pages = max_pages
+        self.page_size = page_size
+        self.size = self._clamp(size)
+
+    def _clamp(self, size: timedelta) -> timedelta:
+        return min(max(size, self.min_size), self.max_size)
+
+    def next_size(self, pages: int, records: int) -> timedelta:
+        """Return the size for the next window, given what the last one returned."""
+        if pages > self.max_pages:
+            self.size = self._clamp(self.size / 2)
+        elif pages <= 1 and records < self.page_size:
+            self.size = self._clamp(self.size * 2)
+        return self.size
@@ -0,0 +1 @@
+"""Offline benchmarks for tap-easyecom, run against a mock EasyEcom API."""
@@ -0,0 +1,206 @@
+"""Run tap-easyecom against the mock API and measure it.
+
+Usage::
+
+    python -m tests.benchmarks.bench sell_orders --records 20000 --latency 0.02
+
+Reports records/sec, requests per record and peak traced memory per stream.
+"""
+
+import argparse
+import io
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional
+
+from tests.benchmarks.mock_server import ENDPOINTS, MockEasyEcom, MockSettings
+
+
+@dataclass
+class BenchmarkResult:
+    stream: str
+    records: int
+    # Records emitted more than once, by primary key.
+    duplicates: int
+    requests: int
+    logins: int
+    throttled: int
+    seconds: float
+    peak_memory: int
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records / self.seconds if self.seconds else 0.0
+
+    @property
+    def requests_per_record(self) -> float:
+        return self.requests / self.records if self.records else float("inf")
+
+    def report(self) -> str:
+        return (
+            f"{self.stream}: {self.records} records in {self.seconds:.2f}s "
+            f"({self.records_per_second:,.0f} records/s), "
+            f"{self.requests_per_record:.3f} requests/record, "
+            f"{self.duplicates} duplicates, "
+            f"{self.logins} logins, {self.throttled} throttled, "
+            f"peak memory {self.peak_memory / 1024 / 1024:.1f} MiB"
+        )
+
+
+class _RecordCounter(io.RawIOBase):
+    """Binary sink for stdout that counts RECORD messages and their keys."""
+
+    def __init__(self, primary_key: str) -> None:
+        self.records = 0
+        self.keys = set()
+        self.primary_key = primary_key
+        self._partial = b""
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        lines = (self._partial + bytes(data)).split(b"\n")
+        self._partial = lines.pop()
+        for line in lines:
+            if line.startswith((b'{"type": "RECORD"', b'{"type":"RECORD"')):
+                self.records += 1
+                self.keys.add(json.loads(line)["record"][self.primary_key])
+        return len(data)
+
+
+def _selected_catalog(tap_class, config_path: str, streams) -> dict:
+    catalog = tap_class(config=[config_path]).catalog_dict
+    for entry in catalog["streams"]:
+        for metadata in entry["metadata"]:
+            if not metadata["breadcrumb"]:
+                metadata["metadata"]["selected"] = entry["tap_stream_id"] in streams
+    return catalog
+
+
+def write_config(
+    directory: str,
+    mock: MockEasyEcom,
+    config: Optional[dict] = None,
+) -> str:
+    """Write a tap config pointing at `mock`; return its path."""
+    config_path = str(Path(directory, "config.json"))
+    Path(config_path).write_text(
+        json.dumps(
+            {
+                "api_url": mock.url,
+                "email": "bench@example.com",
+                "password": "secret",
+                "location_key": "bench",
+                "start_date": (
+                    datetime.utcnow()
+                    - timedelta(days=mock.settings.history_days + 1)
+                ).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                **(config or {}),
+            }
+        )
+    )
+    return config_path
+
+
+def sync_messages(
+    config_path: str,
+    streams: Optional[List[str]] = None,
+    state: Optional[dict] = None,
+) -> List[dict]:
+    """Sync `streams`, or every stream, and return the messages written.
+
+    Messages written before a failing sync ends are attached to the
+    exception as `messages`.
+    """
+    from tap_easyecom.tap import TapEasyEcom
+
+    catalog = None
+    if streams is not None:
+        catalog = _selected_catalog(TapEasyEcom, config_path, streams)
+    output = io.BytesIO()
+    stdout = sys.stdout
+    sys.stdout = io.TextIOWrapper(output, write_through=True)
+    try:
+        TapEasyEcom(config=[config_path], catalog=catalog, state=state).sync_all()
+        sys.stdout.flush()
+    except Exception as ex:
+        sys.stdout.flush()
+        ex.messages = [json.loads(line) for line in output.getvalue().splitlines()]
+        raise
+    finally:
+        sys.stdout.detach()
+        sys.stdout = stdout
+    return [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+def run_benchmark(
+    stream: str,
+    settings: MockSettings,
+    config: Optional[dict] = None,
+) -> BenchmarkResult:
+    """Sync `stream` from a fresh mock API and measure the run."""
+    from tap_easyecom.tap import TapEasyEcom
+
+    with MockEasyEcom(settings) as mock, tempfile.TemporaryDirectory() as tmp:
+        config_path = write_config(tmp, mock, config)
+        catalog = _selected_catalog(TapEasyEcom, config_path, [stream])
+
+        counter = _RecordCounter(ENDPOINTS[stream].primary_key)
+        stdout = sys.stdout
+        sys.stdout = io.TextIOWrapper(io.BufferedWriter(counter), write_through=True)
+        tracemalloc.start()
+        started = time.perf_counter()
+        try:
+            TapEasyEcom(config=[config_path], catalog=catalog).sync_all()
+            sys.stdout.flush()
+        finally:
+            seconds = time.perf_counter() - started
+            _, peak_memory = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            sys.stdout = stdout
+
+        return BenchmarkResult(
+            stream=stream,
+            records=counter.records,
+            duplicates=counter.records - len(counter.keys),
+            requests=mock.requests,
+            logins=mock.logins,
+            throttled=mock.throttled,
+            seconds=seconds,
+            peak_memory=peak_memory,
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("streams", nargs="*", default=list(ENDPOINTS))
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--history-days", type=int, default=365)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float)
+    parser.add_argument("--token-max-requests", type=int)
+    parser.add_argument(
+        "--config", type=json.loads, default={}, help="Extra tap config as JSON."
+    )
+    args = parser.parse_args()
+
+    for stream in args.streams:
+        settings = MockSettings(
+            volumes={stream: args.records},
+            history_days=args.history_days,
+            latency=args.latency,
+            rate_limit=args.rate_limit,
+            token_max_requests=args.token_max_requests,
+        )
+        print(run_benchmark(stream, settings, args.config).report(), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""A local stand-in for the EasyEcom API, used by the benchmark suite.
+
+It imitates what the tap relies on: `/access/token` logins, `nextUrl` cursor
+pagination, `updated_after`/`updated_before` style date filters,
+"No Data Found" bodies, 401s once a token expires, 429s with
+`Retry-After` when requests come in faster than the configured rate and
+errors once a configured number of requests was answered.
+"""
+
+import base64
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+@dataclass
+class Endpoint:
+    """How one EasyEcom endpoint shapes and filters its records."""
+
+    path: str
+    primary_key: str
+    date_field: str
+    # Path of the record list inside `data`, e.g. "orders" for sell orders.
+    records_key: Optional[str] = None
+    after_params: tuple = ("updated_after", "created_after")
+    before_params: tuple = ("updated_before", "created_before")
+    max_limit: int = 10
+
+
+ENDPOINTS = {
+    "products": Endpoint("/Products/GetProductMaster", "product_id", "updated_at"),
+    "suppliers": Endpoint("/wms/V2/getVendors", "vendor_c_id", "updated_at"),
+    "product_compositions": Endpoint("/Products/getKits", "c_id", "lastUpdateDate"),
+    "sell_orders": Endpoint(
+        "/orders/V2/getAllOrders", "order_id", "last_update_date", "orders", max_limit=50
+    ),
+    "buy_orders": Endpoint(
+        "/wms/V2/getPurchaseOrderDetails", "po_id", "po_updated_date"
+    ),
+    "receipts": Endpoint("/Grn/V2/getGrnDetails", "grn_id", "po_created_date"),
+    "returns": Endpoint(
+        "/orders/getAllReturns", "credit_note_id", "credit_note_date", "credit_notes"
+    ),
+}
+
+
+def make_record(stream: str, endpoint: Endpoint, index: int, updated: datetime) -> dict:
+    """Return a record shaped roughly like the real API's."""
+    record = {
+        endpoint.primary_key: index + 1,
+        endpoint.date_field: updated.strftime(DATE_FORMAT),
+        "sku": f"SKU-{index}",
+        "company_name": "Benchmark Co",
+    }
+    if stream == "products":
+        record.update(
+            active=1,
+            cost=10.5,
+            custom_fields=[{"field_name": "season", "value": "summer"}],
+            variants=[
+                {"sku": f"SKU-{index}-{v}", "cpId": index * 10 + v, "active": 1}
+                for v in range(3)
+            ],
+        )
+    elif stream == "sell_orders":
+        record.update(
+            order_status="Shipped",
+            total_amount=199.0,
+            suborders=[{"sku": f"SKU-{index}", "quantity": 1} for _ in range(3)],
+            address_line_1="1 Benchmark Road",
+        )
+    return record
+
+
+@dataclass
+class MockSettings:
+    """Knobs for the mock API."""
+
+    # Records per stream; streams not listed return "No Data Found".
+    volumes: Dict[str, int] = field(default_factory=dict)
+    # Records are spread evenly over this period, ending now.
+    history_days: int = 365
+    # Seconds added to every response.
+    latency: float = 0.0
+    # A token stops working after this many authenticated requests.
+    token_max_requests: Optional[int] = None
+    # Requests per second allowed before answering 429.
+    rate_limit: Optional[float] = None
+    retry_after: float = 1.0
+    # Requests answered before every further one fails with `fail_status`.
+    fail_after: Optional[int] = None
+    fail_status: int = 400
+
+
+class MockEasyEcom:
+    """Runs the mock API on a local port in a background thread."""
+
+    def __init__(self, settings: MockSettings) -> None:
+        self.settings = settings
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.logins = 0
+        self.location_logins: Dict[str, int] = {}
+        self.throttled = 0
+        self.unauthorized = 0
+        self.records_served = 0
+        # The current token of each location, and requests made with it.
+        self._tokens: Dict[str, str] = {}
+        self._token_requests: Dict[str, int] = {}
+        self._window_started = time.monotonic()
+        self._window_requests = 0
+        self._data: Dict[str, List[dict]] = {}
+        now = datetime.utcnow().replace(microsecond=0)
+        for stream, volume in settings.volumes.items():
+            endpoint = ENDPOINTS[stream]
+            step = timedelta(days=settings.history_days) / max(volume, 1)
+            self._data[endpoint.path] = [
+                make_record(stream, endpoint, i, now - step * (volume - i))
+                for i in range(volume)
+            ]
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "MockEasyEcom":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args) -> None:
+                pass
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                form = parse_qs(self.rfile.read(length).decode())
+                status, body, headers = mock.handle_login(
+                    self.path, form.get("location_key", [""])[0]
+                )
+                self._reply(status, body, headers)
+
+            def do_GET(self) -> None:
+                status, body, headers = mock.handle_get(
+                    self.path, self.headers.get("Authorization", "")
+                )
+                self._reply(status, body, headers)
+
+            def _reply(self, status: int, body: dict, headers: dict) -> None:
+                if mock.settings.latency:
+                    time.sleep(mock.settings.latency)
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
+
+    def handle_login(self, path: str, location_key: str = ""):
+        if urlparse(path).path != "/access/token":
+            return 404, {"message": "Not Found"}, {}
+        with self.lock:
+            self.logins += 1
+            self.location_logins[location_key] = (
+                self.location_logins.get(location_key, 0) + 1
+            )
+            token = f"token-{self.logins}"
+            self._token_requests.pop(self._tokens.get(location_key), None)
+            self._tokens[location_key] = token
+            self._token_requests[token] = 0
+        return 200, {"data": {"token": {"jwt_token": token, "expires_in": 3600}}}, {}
+
+    def handle_get(self, path: str, authorization: str):
+        url = urlparse(path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        with self.lock:
+            self.requests += 1
+            fail_after = self.settings.fail_after
+            if fail_after is not None and self.requests > fail_after:
+                return self.settings.fail_status, {"message": "Failed"}, {}
+            throttled = self._throttle()
+            if throttled:
+                self.throttled += 1
+                return 429, {"message": "Too Many Requests"}, {
+                    "Retry-After": str(self.settings.retry_after)
+                }
+            token = authorization[len("Bearer "):]
+            if token not in self._token_requests or self._token_expired(token):
+                self.unauthorized += 1
+                return 401, {"message": "Token expired"}, {}
+            self._token_requests[token] += 1
+
+        endpoint = next((e for e in ENDPOINTS.values() if e.path == url.path), None)
+        if endpoint is None:
+            return 404, {"message": "Not Found"}, {}
+        records = self._filter(endpoint, params)
+        offset = int(base64.b64decode(params["cursor"])) if "cursor" in params else 0
+        limit = min(int(params.get("limit", 10)), endpoint.max_limit)
+        page = records[offset:offset + limit]
+        with self.lock:
+            self.records_served += len(page)
+        if not page:
+            return 200, {"code": 200, "data": "No Data Found"}, {}
+
+        next_url = None
+        if offset + limit < len(records):
+            cursor = base64.b64encode(str(offset + limit).encode()).decode()
+            next_url = f"{endpoint.path}?cursor={cursor}"
+        if endpoint.records_key:
+            data = {endpoint.records_key: page, "nextUrl": next_url}
+            return 200, {"code": 200, "data": data}, {}
+        return 200, {"code": 200, "data": page, "nextUrl": next_url}, {}
+
+    def _filter(self, endpoint: Endpoint, params: dict) -> List[dict]:
+        records = self._data.get(endpoint.path, [])
+        after = next((params[p] for p in endpoint.after_params if p in params), None)
+        before = next((params[p] for p in endpoint.before_params if p in params), None)
+        if after:
+            records = [r for r in records if r[endpoint.date_field] >= after]
+        if before:
+            records = [r for r in records if r[endpoint.date_field] <= before]
+        return records
+
+    def _token_expired(self, token: str) -> bool:
+        limit = self.settings.token_max_requests
+        return limit is not None and self._token_requests[token] >= limit
+
+    def _throttle(self) -> bool:
+        if not self.settings.rate_limit:
+            return False
+        now = time.monotonic()
+        if now - self._window_started >= 1:
+            self._window_started = now
+            self._window_requests = 0
+        self._window_requests += 1
+        return self._window_requests > self.settings.rate_limit
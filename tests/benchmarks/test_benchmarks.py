@@ -0,0 +1,78 @@
+"""Benchmarks of full syncs against the mock EasyEcom API.
+
+Run with `pytest -s tests/benchmarks` to see the per-stream reports.
+"""
+
+import pytest
+
+pytest.importorskip("singer_sdk")
+
+from singer_sdk.exceptions import ConfigValidationError  # noqa: E402
+
+from tests.benchmarks.bench import run_benchmark  # noqa: E402
+from tests.benchmarks.mock_server import ENDPOINTS, MockSettings  # noqa: E402
+
+RECORDS = 500
+
+
+@pytest.mark.parametrize("stream", list(ENDPOINTS))
+def test_stream_throughput(stream):
+    result = run_benchmark(stream, MockSettings(volumes={stream: RECORDS}))
+    print(result.report())
+
+    assert result.records == RECORDS
+    assert result.duplicates == 0
+    assert result.logins == 1
+
+
+def test_returns_emitted_once_across_window_boundaries():
+    settings = MockSettings(volumes={"returns": RECORDS}, history_days=30)
+    result = run_benchmark("returns", settings)
+
+    assert result.records == RECORDS
+    assert result.duplicates == 0
+
+
+def test_windowed_stream_needs_a_start_date():
+    with pytest.raises(ConfigValidationError, match="start_date"):
+        run_benchmark(
+            "returns", MockSettings(volumes={"returns": 10}), {"start_date": None}
+        )
+
+
+def test_recovers_from_token_expiry():
+    settings = MockSettings(volumes={"products": RECORDS}, token_max_requests=10)
+    result = run_benchmark("products", settings)
+    print(result.report())
+
+    assert result.records == RECORDS
+    assert result.duplicates == 0
+    assert result.logins > 1
+
+
+def test_paces_requests_under_throttling():
+    settings = MockSettings(
+        volumes={"products": 200}, rate_limit=20, retry_after=0.2
+    )
+    result = run_benchmark("products", settings)
+    print(result.report())
+
+    assert result.records == 200
+    assert result.duplicates == 0
+
+
+def test_async_transport_with_window_workers():
+    pytest.importorskip("httpx")
+    settings = MockSettings(
+        volumes={"sell_orders": RECORDS}, latency=0.01, token_max_requests=25
+    )
+    result = run_benchmark(
+        "sell_orders",
+        settings,
+        {"async_transport": True, "window_workers": 4},
+    )
+    print(result.report())
+
+    assert result.records == RECORDS
+    assert result.duplicates == 0
+    assert result.logins > 1
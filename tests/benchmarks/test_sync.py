@@ -0,0 +1,114 @@
+"""Full syncs against the mock EasyEcom API, checked message by message."""
+
+import tempfile
+from collections import Counter
+
+import pytest
+
+pytest.importorskip("singer_sdk")
+
+from tests.benchmarks.bench import sync_messages, write_config  # noqa: E402
+from tests.benchmarks.mock_server import ENDPOINTS, MockEasyEcom, MockSettings  # noqa: E402
+
+VOLUMES = {stream: 120 for stream in ENDPOINTS}
+
+
+def _records(messages):
+    return [message for message in messages if message["type"] == "RECORD"]
+
+
+def test_parallel_streams_emit_every_record_after_its_schema():
+    settings = MockSettings(volumes=VOLUMES, history_days=30, latency=0.002)
+    with MockEasyEcom(settings) as mock, tempfile.TemporaryDirectory() as tmp:
+        messages = sync_messages(write_config(tmp, mock, {"stream_workers": 4}))
+
+    counts = Counter(message["stream"] for message in _records(messages))
+    assert counts == VOLUMES
+    schemas = set()
+    for message in messages:
+        if message["type"] == "SCHEMA":
+            assert message["stream"] not in schemas
+            schemas.add(message["stream"])
+        elif message["type"] == "RECORD":
+            assert message["stream"] in schemas
+    assert messages[-1]["type"] == "STATE"
+    assert set(messages[-1]["value"]["bookmarks"]) >= set(VOLUMES)
+
+
+@pytest.mark.parametrize(
+    "stream, config",
+    [
+        ("products", {}),
+        ("products", {"prefetch_pages": 2}),
+        ("sell_orders", {"window_max_days": 3}),
+        ("returns", {"window_max_days": 3}),
+    ],
+)
+def test_interrupted_sync_resumes_from_checkpoint(stream, config):
+    endpoint = ENDPOINTS[stream]
+    settings = MockSettings(volumes={stream: 200}, history_days=30, fail_after=8)
+    with MockEasyEcom(settings) as mock, tempfile.TemporaryDirectory() as tmp:
+        config_path = write_config(tmp, mock, {"checkpoint_interval": 1, **config})
+        with pytest.raises(Exception) as crash:
+            sync_messages(config_path, [stream])
+        first = crash.value.messages
+        state = [message for message in first if message["type"] == "STATE"][-1]
+        assert state["value"]["bookmarks"][stream]["checkpoint"]
+
+        mock.settings.fail_after = None
+        second = sync_messages(config_path, [stream], state["value"])
+
+    first_ids = {record["record"][endpoint.primary_key] for record in _records(first)}
+    second_ids = {record["record"][endpoint.primary_key] for record in _records(second)}
+    assert first_ids | second_ids == set(range(1, 201))
+    assert len(second_ids) < 200
+    assert "checkpoint" not in second[-1]["value"]["bookmarks"][stream]
+
+
+@pytest.mark.parametrize("stream_workers", [1, 2])
+def test_locations_sync_as_partitions(stream_workers):
+    settings = MockSettings(volumes={"products": 50}, history_days=30)
+    with MockEasyEcom(settings) as mock, tempfile.TemporaryDirectory() as tmp:
+        config_path = write_config(
+            tmp,
+            mock,
+            {"location_keys": ["north", "south"], "stream_workers": stream_workers},
+        )
+        messages = sync_messages(config_path, ["products"])
+        assert mock.location_logins == {"north": 1, "south": 1}
+
+    ids = Counter(
+        (record["record"]["location_key"], record["record"]["product_id"])
+        for record in _records(messages)
+    )
+    assert set(ids) == {
+        (location, product_id)
+        for location in ("north", "south")
+        for product_id in range(1, 51)
+    }
+    assert set(ids.values()) == {1}
+    partitions = messages[-1]["value"]["bookmarks"]["products"]["partitions"]
+    assert sorted(partition["context"]["location_key"] for partition in partitions) == [
+        "north",
+        "south",
+    ]
+    assert all(partition["replication_key_value"] for partition in partitions)
+
+
+def test_sync_ended_early_resumes_after_last_written_page():
+    settings = MockSettings(
+        volumes={"products": 200}, history_days=30, fail_after=8, fail_status=500
+    )
+    with MockEasyEcom(settings) as mock, tempfile.TemporaryDirectory() as tmp:
+        config_path = write_config(tmp, mock, {"circuit_breaker_threshold": 1})
+        first = sync_messages(config_path, ["products"])
+        state = first[-1]["value"]
+        assert state["bookmarks"]["products"]["checkpoint"]
+
+        mock.settings.fail_after = None
+        second = sync_messages(config_path, ["products"], state)
+
+    first_ids = [record["record"]["product_id"] for record in _records(first)]
+    second_ids = [record["record"]["product_id"] for record in _records(second)]
+    assert sorted(first_ids + second_ids) == list(range(1, 201))
+    assert "checkpoint" not in second[-1]["value"]["bookmarks"]["products"]
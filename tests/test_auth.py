@@ -0,0 +1,120 @@
+"""Tests for the shared token manager."""
+
+import logging
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("singer_sdk")
+
+from tap_easyecom.auth import MIN_REFRESH_DELAY, TokenManager
+
+
+class _LoginResponse:
+    def __init__(self, token, expires_in=3600):
+        self.text = token
+        self.expires_in = expires_in
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"data": {"token": {"jwt_token": self.text, "expires_in": self.expires_in}}}
+
+
+class _Session:
+    """Answers logins slowly enough for concurrent callers to pile up."""
+
+    def __init__(self, expires_in=3600):
+        self.logins = 0
+        self.expires_in = expires_in
+        self._lock = threading.Lock()
+
+    def post(self, url, data=None):
+        time.sleep(0.05)
+        with self._lock:
+            self.logins += 1
+            return _LoginResponse(f"token-{self.logins}", self.expires_in)
+
+
+class _Metrics:
+    def observe_token_refresh(self):
+        pass
+
+
+class _Tap:
+    def __init__(self, config=None, expires_in=3600):
+        self._config = dict(config or {})
+        self.logger = logging.getLogger("tap-easyecom-test")
+        self.transport = None
+        self.requests_session = _Session(expires_in)
+        self.metrics = _Metrics()
+        self._token_manager_lock = threading.Lock()
+
+    @property
+    def config(self):
+        return self._config
+
+
+def _get_tokens_concurrently(manager, callers=8):
+    tokens = []
+    threads = [
+        threading.Thread(target=lambda: tokens.append(manager.get_token()))
+        for _ in range(callers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return tokens
+
+
+def test_concurrent_cold_start_logs_in_once():
+    tap = _Tap()
+    manager = TokenManager(tap, "https://api.example.com/access/token")
+
+    tokens = _get_tokens_concurrently(manager)
+
+    assert tap.requests_session.logins == 1
+    assert tokens == ["token-1"] * 8
+
+
+def test_expired_token_refreshed_once():
+    expired_at = round(datetime.utcnow().timestamp()) - 7200
+    tap = _Tap(
+        {"access_token": "old", "created_at": expired_at, "expires_in": 3600}
+    )
+    manager = TokenManager(tap, "https://api.example.com/access/token")
+
+    tokens = _get_tokens_concurrently(manager)
+
+    assert tap.requests_session.logins == 1
+    assert tokens == ["token-1"] * 8
+
+
+def test_rejected_token_refreshed_unless_already_replaced():
+    tap = _Tap()
+    manager = TokenManager(tap, "https://api.example.com/access/token")
+    manager.get_token()
+
+    manager.refresh(stale_token="token-1")
+    assert manager.access_token == "token-2"
+    manager.refresh(stale_token="token-1")
+    assert tap.requests_session.logins == 2
+
+
+@pytest.mark.parametrize(
+    "expires_in, delay", [(120, MIN_REFRESH_DELAY * 2), (40, MIN_REFRESH_DELAY)]
+)
+def test_short_lived_token_not_renewed_immediately(expires_in, delay):
+    tap = _Tap(expires_in=expires_in)
+    manager = TokenManager(tap, "https://api.example.com/access/token")
+    manager.get_token()
+    try:
+        assert manager._timer.interval == delay
+        time.sleep(0.2)
+        assert tap.requests_session.logins == 1
+    finally:
+        manager._timer.cancel()
@@ -0,0 +1,85 @@
+"""Tests for the on-disk response cache."""
+
+import json
+
+import pytest
+import requests
+
+from tap_easyecom.cache import ResponseCache, cache_key
+
+
+def _request(url):
+    return requests.Request("GET", url).prepare()
+
+
+def _response(body):
+    response = requests.Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = "application/json"
+    response.headers["Content-Encoding"] = "gzip"
+    response._content = body
+    return response
+
+
+def test_cache_key_ignores_parameter_order():
+    assert cache_key("a", "GET", "http://x/p?limit=10&cursor=c") == cache_key(
+        "a", "GET", "http://x/p?cursor=c&limit=10"
+    )
+    assert cache_key("a", "GET", "http://x/p?cursor=c") != cache_key(
+        "b", "GET", "http://x/p?cursor=c"
+    )
+
+
+def test_cache_expires_entries(tmp_path):
+    now = [1000.0]
+    cache = ResponseCache(str(tmp_path), clock=lambda: now[0])
+    closed = _request("http://x/orders?updated_before=2023-01-08")
+    recent = _request("http://x/products?cursor=abc")
+    cache.put(closed, _response(b'{"data": [1]}'), ttl=None)
+    cache.put(recent, _response(b'{"data": [2]}'), ttl=60)
+
+    response = cache.get(recent)
+    assert response.json() == {"data": [2]}
+    assert "Content-Encoding" not in response.headers
+
+    now[0] += 61
+    assert cache.get(recent) is None
+    assert cache.get(closed).content == b'{"data": [1]}'
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_size=0)
+    request = _request("http://x/products?cursor=abc")
+    cache.put(request, _response(b"{}"), ttl=None)
+    assert cache.get(request) is None
+    assert not list(tmp_path.iterdir())
+
+
+def test_open_ended_date_filters_are_never_cached(tmp_path):
+    pytest.importorskip("singer_sdk")
+    from tap_easyecom.tap import TapEasyEcom
+
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({"response_cache_ttl": 3600}))
+    tap = TapEasyEcom(config=[str(config_path)], validate_config=False)
+    products = tap.streams["products"]
+    receipts = tap.streams["receipts"]
+    sell_orders = tap.streams["sell_orders"]
+
+    assert products._cache_ttl(
+        _request("http://x/products?updated_after=2023-01-01+00%3A00%3A00")
+    ) == 0
+    assert products._cache_ttl(_request("http://x/products?cursor=abc")) == 3600
+    assert receipts._cache_ttl(
+        _request("http://x/grn?created_after=2023-01-01+00%3A00%3A00")
+    ) == 0
+    assert sell_orders._cache_ttl(
+        _request(
+            "http://x/orders?updated_after=2023-01-01+00%3A00%3A00"
+            "&updated_before=2023-01-08+00%3A00%3A00"
+        )
+    ) is None
+    assert sell_orders._cache_ttl(
+        _request("http://x/orders?updated_after=2023-01-01+00%3A00%3A00")
+    ) == 0
@@ -0,0 +1,27 @@
+"""Tests for change detection in full-table streams."""
+
+from tap_easyecom.changes import RecordHashStore, content_hash
+
+
+def test_content_hash_ignores_key_order():
+    assert content_hash({"a": 1, "b": [1, 2]}) == content_hash({"b": [1, 2], "a": 1})
+    assert content_hash({"a": 1}) != content_hash({"a": 2})
+
+
+def test_store_skips_unchanged_and_reports_deleted(tmp_path):
+    path = str(tmp_path / "suppliers.json.gz")
+    store = RecordHashStore(path, ["vendor_c_id"])
+    assert store.has_changed({"vendor_c_id": 1, "vendor_name": "A"})
+    assert store.has_changed({"vendor_c_id": 2, "vendor_name": "B"})
+    store.save()
+
+    store = RecordHashStore(path, ["vendor_c_id"])
+    assert not store.has_changed({"vendor_name": "A", "vendor_c_id": 1})
+    assert store.has_changed({"vendor_c_id": 3, "vendor_name": "C"})
+    assert [store.key_record(key) for key in store.deleted_keys()] == [
+        {"vendor_c_id": 2}
+    ]
+    store.save()
+
+    store = RecordHashStore(path, ["vendor_c_id"])
+    assert list(store.deleted_keys()) == [1, 3]
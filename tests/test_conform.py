@@ -0,0 +1,111 @@
+"""Tests for the compiled record conformers."""
+
+import copy
+import logging
+
+import pytest
+
+pytest.importorskip("singer_sdk")
+
+from singer_sdk.helpers._typing import conform_record_data_types  # noqa: E402
+
+from tap_easyecom.conform import (  # noqa: E402
+    compile_record_conformer,
+    deselected_paths,
+)
+from tap_easyecom.streams import ProductsStream, SellOrdersStream  # noqa: E402
+
+LOGGER = logging.getLogger("tap-easyecom")
+
+VARIANT = {
+    "sku": "SKU-1-A",
+    "cpId": 11,
+    "active": 1,
+    "created_at": "2023-01-01 10:00:00",
+    "cost": 10.5,
+    "custom_fields": [
+        {"cp_id": 11, "field_name": "color", "value": "red", "enabled": 1}
+    ],
+}
+
+PRODUCT = {
+    "cp_id": 1,
+    "product_id": 1,
+    "sku": "SKU-1",
+    "active": 1,
+    "created_at": "2023-01-01 10:00:00",
+    "updated_at": "2023-02-01 10:00:00",
+    "cost": 12.25,
+    "vendor_code": ["V1", "V2"],
+    "custom_fields": {"season": "summer"},
+    "variants": [VARIANT, VARIANT],
+    "sub_products": [{"sku": "SKU-2", "quantity": 2, "custom_fields": []}],
+}
+
+
+def test_matches_sdk_conformance_on_top_level_fields():
+    conform = compile_record_conformer(ProductsStream.schema, "products", LOGGER)
+    record = {**PRODUCT, "unknown": "dropped"}
+
+    expected = conform_record_data_types(
+        "products", copy.deepcopy(record), ProductsStream.schema, LOGGER
+    )
+    assert conform(copy.deepcopy(record)) == expected
+    assert "unknown" not in expected
+
+
+def test_prunes_and_coerces_nested_arrays(caplog):
+    conform = compile_record_conformer(ProductsStream.schema, "products", LOGGER)
+    record = {
+        **PRODUCT,
+        "active": 0,
+        "variants": [{**VARIANT, "unknown": 1}, {**VARIANT, "unknown": 2}],
+    }
+
+    result = conform(record)
+    conform(copy.deepcopy(record))
+
+    assert result["active"] is False
+    assert result["variants"] == [VARIANT, VARIANT]
+    assert result["custom_fields"] == {"season": "summer"}
+    assert [record.getMessage() for record in caplog.records] == [
+        "Property 'variants.unknown' was present in the 'products' stream "
+        "but not found in catalog schema. Ignoring."
+    ]
+
+
+def test_drops_deselected_properties_without_warning(caplog):
+    conform = compile_record_conformer(
+        ProductsStream.schema, "products", LOGGER, [("variants",), ("sub_products",)]
+    )
+
+    result = conform(copy.deepcopy(PRODUCT))
+
+    assert "variants" not in result
+    assert "sub_products" not in result
+    assert result["vendor_code"] == ["V1", "V2"]
+    assert not caplog.records
+
+
+def test_drops_deselected_nested_properties(caplog):
+    mask = {
+        ("properties", "documents", "properties", "label"): False,
+        ("properties", "meta"): False,
+    }
+    deselected = set(deselected_paths(SellOrdersStream.schema, mask))
+    assert deselected == {("documents", "label"), ("meta",)}
+    conform = compile_record_conformer(
+        SellOrdersStream.schema, "sell_orders", LOGGER, deselected
+    )
+
+    result = conform(
+        {
+            "order_id": 1,
+            "meta": {"source": "api"},
+            "documents": {"label": "https://x/label.pdf", "easyecom_invoice": "inv"},
+        }
+    )
+
+    assert result == {"order_id": 1, "documents": {"easyecom_invoice": "inv"}}
+    assert not caplog.records
+
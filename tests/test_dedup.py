@@ -0,0 +1,14 @@
+"""Tests for duplicate suppression."""
+
+from tap_easyecom.dedup import RecentKeys
+
+
+def test_drops_recent_duplicates_with_bounded_memory():
+    keys = RecentKeys(max_size=2)
+    assert not keys.seen((1, "2023-01-01 10:00:00"))
+    assert not keys.seen((1, "2023-01-02 10:00:00"))
+    assert keys.seen((1, "2023-01-01 10:00:00"))
+    assert not keys.seen((2, "2023-01-01 10:00:00"))
+    # (1, "2023-01-02 ...") was the least recently seen key.
+    assert not keys.seen((1, "2023-01-02 10:00:00"))
+    assert keys.duplicates == 1
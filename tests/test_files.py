@@ -0,0 +1,28 @@
+"""Tests for atomic file writes."""
+
+import os
+
+import pytest
+
+from tap_easyecom.files import atomic_write
+
+
+def test_atomic_write_replaces_file(tmp_path):
+    path = tmp_path / "state" / "store.json"
+    atomic_write(str(path), "first")
+    atomic_write(str(path), b"second", "wb", permissions=0o644, fsync=True)
+
+    assert path.read_bytes() == b"second"
+    assert os.stat(path).st_mode & 0o777 == 0o644
+    assert os.listdir(path.parent) == ["store.json"]
+
+
+def test_failed_write_keeps_old_file(tmp_path):
+    path = tmp_path / "store.json"
+    path.write_text("old")
+
+    with pytest.raises(TypeError):
+        atomic_write(str(path), b"new")
+
+    assert path.read_text() == "old"
+    assert os.listdir(tmp_path) == ["store.json"]
@@ -0,0 +1,46 @@
+"""Tests for the shared response decoding helpers."""
+
+import requests
+
+from tap_easyecom.jsonlib import compile_records_path, extract_records, response_json
+
+
+def make_response(body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body
+    return response
+
+
+def test_response_json_decodes_once():
+    response = make_response(b'{"data": {"orders": [{"order_id": 1}]}}')
+    payload = response_json(response)
+    response._content = b"not json any more"
+
+    assert response_json(response) is payload
+
+
+def test_compile_records_path():
+    assert compile_records_path("$.data[*]") == ("data",)
+    assert compile_records_path("$.data.credit_notes[*]") == ("data", "credit_notes")
+    assert compile_records_path("$[*]") == ()
+    assert compile_records_path("$.data[?(@.id)]") is None
+
+
+def test_extract_records_follows_envelopes():
+    payload = {"data": {"orders": [{"order_id": 1}, {"order_id": 2}]}}
+
+    assert list(extract_records(payload, ("data", "orders"))) == [
+        {"order_id": 1},
+        {"order_id": 2},
+    ]
+    assert list(extract_records(payload, ("data", "credit_notes"))) == []
+    assert list(extract_records({"data": "No Data Found"}, ("data", "orders"))) == []
+
+
+def test_extract_records_yields_single_object():
+    payload = {"data": {"order_id": 1, "items": [{"sku": "A"}]}}
+
+    assert list(extract_records(payload, ("data",))) == [
+        {"order_id": 1, "items": [{"sku": "A"}]}
+    ]
@@ -0,0 +1,28 @@
+"""Tests for request metrics and their Prometheus export."""
+
+from tap_easyecom.metrics import SyncMetrics
+
+
+def test_prometheus_textfile(tmp_path):
+    metrics = SyncMetrics()
+    metrics.observe_request("products", "/Products/GetProductMaster", 0.2, 200, 1500)
+    metrics.observe_request("products", "/Products/GetProductMaster", 0.7, 429, 20)
+    metrics.observe_page("products", "/Products/GetProductMaster", 10)
+    metrics.observe_retry("products", "/Products/GetProductMaster", 2.5)
+    metrics.observe_duplicates("products", "/Products/GetProductMaster", 3)
+    metrics.observe_token_refresh()
+
+    path = tmp_path / "easyecom.prom"
+    metrics.write_prometheus(str(path))
+    text = path.read_text()
+
+    labels = 'stream="products",endpoint="/Products/GetProductMaster"'
+    assert f'easyecom_request_duration_seconds_bucket{{{labels},le="0.25"}} 1' in text
+    assert f'easyecom_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f"easyecom_request_duration_seconds_count{{{labels}}} 2" in text
+    assert f"easyecom_response_bytes_total{{{labels}}} 1520" in text
+    assert f"easyecom_records_total{{{labels}}} 10" in text
+    assert f"easyecom_backoff_seconds_total{{{labels}}} 2.5" in text
+    assert f"easyecom_throttled_total{{{labels}}} 1" in text
+    assert f"easyecom_duplicates_total{{{labels}}} 3" in text
+    assert "easyecom_token_refreshes_total 1" in text
@@ -0,0 +1,65 @@
+"""Tests for coalescing STATE messages."""
+
+import json
+
+import pytest
+
+singer = pytest.importorskip("singer")
+
+from tap_easyecom.output import MessageWriter
+
+
+def _states(capsys):
+    lines = capsys.readouterr().out.splitlines()
+    return [json.loads(line)["value"] for line in lines if '"STATE"' in line]
+
+
+def _record(n):
+    return singer.RecordMessage(stream="orders", record={"id": n})
+
+
+def test_states_coalesced_by_record_count(capsys):
+    writer = MessageWriter(state_interval_records=3)
+    state = {"bookmarks": {}}
+    for n in range(7):
+        writer.write_message(_record(n))
+        state["bookmarks"]["orders"] = n
+        writer.write_state(state)
+    assert _states(capsys) == [{"bookmarks": {"orders": 2}}, {"bookmarks": {"orders": 5}}]
+
+    writer.close()
+    assert _states(capsys) == [{"bookmarks": {"orders": 6}}]
+    writer.close()
+    assert _states(capsys) == []
+
+
+def test_states_coalesced_by_time(capsys):
+    now = [0.0]
+    writer = MessageWriter(state_interval_seconds=10, clock=lambda: now[0])
+    writer.write_state({"n": 1})
+    now[0] += 11
+    writer.write_state({"n": 2})
+    writer.write_state({"n": 3}, force=True)
+    assert _states(capsys) == [{"n": 2}, {"n": 3}]
+
+
+def test_every_state_written_by_default(capsys):
+    writer = MessageWriter()
+    writer.write_state({"n": 1})
+    writer.write_state({"n": 2})
+    assert _states(capsys) == [{"n": 1}, {"n": 2}]
+
+
+def test_state_waits_for_open_batch_files(tmp_path, capsys):
+    writer = MessageWriter(batch_dir=str(tmp_path))
+    writer.write_batch_record("orders", {"id": 1})
+    writer.write_state({"n": 1})
+    writer.write_batch_record("orders", {"id": 2})
+    writer.write_state({"n": 2}, force=True)
+    assert capsys.readouterr().out == ""
+
+    writer.close_batch_file("orders")
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [message["type"] for message in messages] == ["BATCH", "STATE"]
+    assert messages[1]["value"] == {"n": 2}
+    assert len(list(tmp_path.iterdir())) == 1
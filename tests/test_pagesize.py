@@ -0,0 +1,50 @@
+"""Tests for page size detection."""
+
+from tap_easyecom.pagesize import PageSizeStore, detect_page_size
+
+
+def _endpoint(max_limit, total, rejects_above=None):
+    calls = []
+
+    def probe(limit):
+        calls.append(limit)
+        if rejects_above is not None and limit > rejects_above:
+            return None
+        records = min(limit, max_limit, total)
+        return records, records < total
+
+    return probe, calls
+
+
+def test_detects_silently_capped_limit():
+    probe, calls = _endpoint(max_limit=50, total=500)
+    assert detect_page_size(probe, 1000, 10) == 50
+    assert calls == [1000]
+
+
+def test_halves_rejected_limits():
+    probe, calls = _endpoint(max_limit=1000, total=5000, rejects_above=300)
+    assert detect_page_size(probe, 1000, 10) == 250
+    assert calls == [1000, 500, 250]
+
+
+def test_unknown_without_records():
+    probe, _ = _endpoint(max_limit=50, total=0)
+    assert detect_page_size(probe, 1000, 10) is None
+
+
+def test_unknown_with_fewer_records_than_the_limit():
+    probe, calls = _endpoint(max_limit=1000, total=120)
+    assert detect_page_size(probe, 1000, 10) is None
+    assert calls == [1000]
+
+
+def test_store_expires_entries(tmp_path):
+    now = [0.0]
+    path = str(tmp_path / "page_sizes.json")
+    PageSizeStore(path, ttl=60, clock=lambda: now[0]).set("/orders", 50)
+
+    store = PageSizeStore(path, ttl=60, clock=lambda: now[0])
+    assert store.get("/orders") == 50
+    now[0] = 61
+    assert store.get("/orders") is None
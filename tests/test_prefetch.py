@@ -0,0 +1,62 @@
+"""Tests for fetching pages ahead on a background thread."""
+
+import itertools
+import threading
+
+import pytest
+
+pytest.importorskip("singer_sdk")
+
+from tap_easyecom.client import EasyEcomStream  # noqa: E402
+from tap_easyecom.resilience import DeadlineExceeded  # noqa: E402
+
+
+class _Stream:
+    name = "orders"
+
+    def __init__(self, pages):
+        self._pages = pages
+        self.fetched = 0
+
+    def _iter_pages(self, context):
+        for page in self._pages:
+            self.fetched += 1
+            yield page
+
+    def prefetch(self, max_pages=2):
+        return EasyEcomStream._prefetch_pages(self, None, max_pages)
+
+
+def _prefetch_threads():
+    return [t for t in threading.enumerate() if t.name == "orders-prefetch"]
+
+
+def test_pages_come_out_in_order():
+    assert list(_Stream(range(50)).prefetch()) == list(range(50))
+    assert not _prefetch_threads()
+
+
+def test_fetcher_error_reaches_the_caller():
+    def pages():
+        yield 1
+        raise DeadlineExceeded("The time budget of orders is spent.")
+
+    pages_seen = []
+    with pytest.raises(DeadlineExceeded):
+        for page in _Stream(pages()).prefetch():
+            pages_seen.append(page)
+    assert pages_seen == [1]
+    assert not _prefetch_threads()
+
+
+def test_fetcher_stops_when_the_caller_stops_early():
+    stream = _Stream(itertools.count())
+    pages = stream.prefetch(max_pages=3)
+    assert next(pages) == 0
+
+    # Like get_records ending the stream on a spent budget or open circuit.
+    pages.close()
+
+    assert not _prefetch_threads()
+    # One page taken, three queued and one waiting for room.
+    assert stream.fetched <= 5
@@ -0,0 +1,91 @@
+"""Tests for the shared adaptive rate limiter."""
+
+import requests
+
+from tap_easyecom.ratelimit import AdaptiveRateLimiter, parse_retry_after
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def make_response(status_code, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    return response
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT", now=1445412470) == 10.0
+
+
+def test_paces_requests_at_rate():
+    clock = FakeClock()
+    limiter = AdaptiveRateLimiter(rate=2.0, clock=clock, sleep=clock.sleep)
+
+    for _ in range(5):
+        limiter.acquire()
+
+    assert clock.now == 2.0
+
+
+def test_429_honors_retry_after_and_slows_down():
+    clock = FakeClock()
+    limiter = AdaptiveRateLimiter(rate=10.0, clock=clock, sleep=clock.sleep)
+    limiter.acquire()
+
+    limiter.observe(make_response(429, {"Retry-After": "5"}))
+
+    assert limiter.rate < 10.0
+    assert limiter.throttled == 1
+    assert limiter.acquire() >= 5.0
+
+
+def test_success_recovers_rate_up_to_max():
+    limiter = AdaptiveRateLimiter(rate=1.0, max_rate=1.1, increase=0.05)
+
+    for _ in range(10):
+        limiter.observe(make_response(200))
+
+    assert limiter.rate == 1.1
+
+
+def test_recovery_without_max_rate_stops_below_first_429():
+    clock = FakeClock()
+    limiter = AdaptiveRateLimiter(clock=clock, sleep=clock.sleep)
+    for _ in range(20):
+        limiter.acquire()
+        clock.now += 0.25
+
+    limiter.observe(make_response(429, {"Retry-After": "0"}))
+    throttled_rate = limiter.max_rate
+    for _ in range(1000):
+        limiter.observe(make_response(200))
+
+    assert 0 < throttled_rate <= 4.0
+    assert limiter.rate == throttled_rate
+
+
+def test_quota_headers_cap_rate():
+    clock = FakeClock()
+    limiter = AdaptiveRateLimiter(clock=clock, sleep=clock.sleep)
+
+    limiter.observe(
+        make_response(200, {"X-RateLimit-Remaining": "10", "X-RateLimit-Reset": "10"})
+    )
+    assert limiter.rate == 0.9
+
+    limiter.observe(
+        make_response(200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "30"})
+    )
+    assert limiter.acquire() >= 30.0
@@ -0,0 +1,50 @@
+"""Tests for time budgets and the circuit breaker."""
+
+import math
+
+import pytest
+
+from tap_easyecom.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    Deadline,
+)
+
+
+def test_deadline_counts_down():
+    now = [100.0]
+    deadline = Deadline(30, clock=lambda: now[0])
+    assert deadline.remaining() == 30
+    now[0] += 45
+    assert deadline.remaining() == 0
+    assert deadline.expired()
+    assert Deadline().remaining() == math.inf
+
+    unlimited = Deadline()
+    unlimited.expire()
+    assert unlimited.expired()
+
+
+def test_circuit_opens_after_repeated_failures_and_recovers():
+    now = [0.0]
+    breaker = CircuitBreaker(threshold=3, reset_timeout=60, clock=lambda: now[0])
+    for _ in range(2):
+        breaker.record_failure("/orders")
+    breaker.check("/orders")
+
+    breaker.record_failure("/orders")
+    with pytest.raises(CircuitOpenError):
+        breaker.check("/orders")
+    breaker.check("/Products")
+
+    # After the timeout one trial request goes through; failing reopens.
+    now[0] = 61
+    breaker.check("/orders")
+    breaker.record_failure("/orders")
+    with pytest.raises(CircuitOpenError):
+        breaker.check("/orders")
+
+    now[0] = 122
+    breaker.record_success("/orders")
+    breaker.record_failure("/orders")
+    breaker.check("/orders")
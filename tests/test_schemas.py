@@ -0,0 +1,47 @@
+"""Tests for the prebuilt stream schemas."""
+
+import pytest
+
+from tap_easyecom.schemas import SCHEMAS_DIR, StreamSchema, load_schema
+
+
+def test_schema_files_load():
+    names = sorted(path.stem for path in SCHEMAS_DIR.glob("*.json"))
+    assert names == [
+        "buy_orders",
+        "product_compositions",
+        "products",
+        "receipts",
+        "returns",
+        "sell_orders",
+        "suppliers",
+    ]
+    for name in names:
+        assert load_schema(name)["type"] == "object"
+
+
+def test_stream_schema_is_loaded_by_stream_name():
+    class Stream:
+        name = "sell_orders"
+        schema = StreamSchema()
+
+    assert Stream.schema is load_schema("sell_orders")
+    assert Stream().schema["properties"]["order_id"] == {"type": ["integer", "null"]}
+
+
+
+def test_custom_fields_requested_while_variants_are_selected():
+    pytest.importorskip("singer_sdk")
+    from tap_easyecom.client import EasyEcomStream
+    from tap_easyecom.streams import ProductsStream
+
+    class Stream:
+        param_properties = ProductsStream.param_properties
+        mask = {
+            ("properties", "custom_fields"): False,
+            ("properties", "sub_products"): False,
+        }
+
+    assert EasyEcomStream._param_selected(Stream(), "custom_fields")
+    Stream.mask[("properties", "variants")] = False
+    assert not EasyEcomStream._param_selected(Stream(), "custom_fields")
@@ -0,0 +1,54 @@
+"""Tests for the async HTTP transport."""
+
+import asyncio
+
+import pytest
+import requests
+
+pytest.importorskip("httpx")
+
+from tap_easyecom.transport import AsyncTransport  # noqa: E402
+from tests.benchmarks.mock_server import MockEasyEcom, MockSettings  # noqa: E402
+
+
+@pytest.fixture
+def transport():
+    transport = AsyncTransport(max_concurrency=4)
+    yield transport
+    transport.close()
+
+
+def test_sends_requests_and_returns_requests_responses(transport):
+    with MockEasyEcom(MockSettings(volumes={"suppliers": 15})) as mock:
+        login = transport.post(f"{mock.url}/access/token", data={"email": "a"})
+        token = login.json()["data"]["token"]["jwt_token"]
+
+        prepared = requests.Request(
+            "GET",
+            f"{mock.url}/wms/V2/getVendors",
+            params={"limit": 10},
+            headers={"Authorization": f"Bearer {token}"},
+        ).prepare()
+        response = transport.send(prepared, timeout=5)
+
+    assert isinstance(response, requests.Response)
+    assert response.status_code == 200
+    assert response.request is prepared
+    assert len(response.json()["data"]) == 10
+    assert response.json()["nextUrl"]
+
+
+def test_map_in_order_runs_coroutines_concurrently(transport):
+    async def work(delay):
+        await asyncio.sleep(delay)
+        return delay * 10
+
+    results = list(transport.map_in_order(work, [0.05, 0.01, 0.03], 3))
+
+    assert results == [(0.05, 0.5), (0.01, 0.1), (0.03, 0.3)]
+
+
+def test_transport_errors_are_raised_as_requests_errors(transport):
+    prepared = requests.Request("GET", "http://127.0.0.1:9/").prepare()
+    with pytest.raises(requests.exceptions.ConnectionError):
+        transport.send(prepared, timeout=1)
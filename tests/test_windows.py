@@ -0,0 +1,58 @@
+"""Tests for the date window helpers."""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+from tap_easyecom.windows import DateWindow, WindowSizer, map_in_order, split_windows
+
+
+def test_split_windows_matches_sequential_walk():
+    start = datetime(2023, 1, 1)
+    windows = split_windows(start, datetime(2023, 1, 20), timedelta(days=7))
+
+    assert windows[0] == DateWindow(start, datetime(2023, 1, 8))
+    for previous, window in zip(windows, windows[1:]):
+        assert window.start == previous.end - timedelta(seconds=1)
+        assert window.end == previous.end + timedelta(days=7)
+    assert windows[-1].end >= datetime(2023, 1, 20)
+    assert windows[-2].end < datetime(2023, 1, 20)
+
+
+def test_map_in_order_keeps_order_and_bounds_concurrency():
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def work(item):
+        with lock:
+            running.append(item)
+            peak.append(len(running))
+        # Later items finish first.
+        time.sleep(0.01 * (5 - item))
+        with lock:
+            running.remove(item)
+        return item * 10
+
+    results = list(map_in_order(work, range(5), max_workers=3))
+
+    assert results == [(i, i * 10) for i in range(5)]
+    assert max(peak) <= 3
+
+
+def test_window_sizer_grows_and_splits_within_bounds():
+    sizer = WindowSizer(
+        timedelta(days=7),
+        min_size=timedelta(days=1),
+        max_size=timedelta(days=20),
+        max_pages=5,
+        page_size=50,
+    )
+
+    assert sizer.next_size(pages=1, records=3) == timedelta(days=14)
+    assert sizer.next_size(pages=0, records=0) == timedelta(days=20)
+    assert sizer.next_size(pages=3, records=150) == timedelta(days=20)
+    assert sizer.next_size(pages=9, records=450) == timedelta(days=10)
+    for _ in range(5):
+        sizer.next_size(pages=9, records=450)
+    assert sizer.size == timedelta(days=1)